@@ -14,7 +14,7 @@ from app.db.base import Base
 from app.config import settings
 
 # Import all models so Alembic can discover them
-from app.models import Director, Genre, Movie, MovieRating, movie_genres
+from app.models import Director, Genre, Movie, MovieRating, MovieRatingStats, movie_genres
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,33 @@
+"""Add movie_ratings (movie_id, rated_at, id) index
+
+Revision ID: 282492834d49
+Revises: 70956726454f
+Create Date: 2026-10-18 19:12:05.331846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '282492834d49'
+down_revision: Union[str, Sequence[str], None] = '70956726454f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, and does not lock out writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_movie_ratings_movie_id_rated_at_id', 'movie_ratings', ['movie_id', 'rated_at', 'id'], unique=False,
+            postgresql_include=['score'], postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_movie_ratings_movie_id_rated_at_id', table_name='movie_ratings', postgresql_concurrently=True)
@@ -0,0 +1,28 @@
+"""Add trigram index on movie title
+
+Revision ID: 50a6d2478134
+Revises: 96ccabc169e8
+Create Date: 2026-10-18 11:14:37.902561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '50a6d2478134'
+down_revision: Union[str, Sequence[str], None] = '96ccabc169e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_movies_title_trgm', 'movies', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movies_title_trgm', table_name='movies', postgresql_using='gin')
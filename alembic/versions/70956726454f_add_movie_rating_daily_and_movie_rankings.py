@@ -0,0 +1,68 @@
+"""Add movie_rating_daily and movie_rankings tables
+
+Revision ID: 70956726454f
+Revises: e8c35c7c66f1
+Create Date: 2026-10-18 18:02:37.540212
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '70956726454f'
+down_revision: Union[str, Sequence[str], None] = 'e8c35c7c66f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCORE_COLUMNS = [f'score_{score}' for score in range(1, 11)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('movie_rating_daily',
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('ratings_sum', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('ratings_count', sa.Integer(), server_default='0', nullable=False),
+    *[sa.Column(column, sa.Integer(), server_default='0', nullable=False) for column in SCORE_COLUMNS],
+    sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('movie_id', 'day')
+    )
+    op.create_index('ix_movie_rating_daily_day', 'movie_rating_daily', ['day'], unique=False)
+    # Backfill the rollup for ratings that already exist
+    histogram = ', '.join(f'COUNT(*) FILTER (WHERE score = {score})' for score in range(1, 11))
+    op.execute(
+        f"INSERT INTO movie_rating_daily (movie_id, day, ratings_sum, ratings_count, {', '.join(SCORE_COLUMNS)}) "
+        f"SELECT movie_id, (rated_at AT TIME ZONE 'UTC')::date, SUM(score), COUNT(*), {histogram} "
+        f"FROM movie_ratings GROUP BY movie_id, (rated_at AT TIME ZONE 'UTC')::date"
+    )
+
+    # Filled by the ranking refresher on startup (or scripts/refresh_rankings.py)
+    op.create_table('movie_rankings',
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('average_rating', sa.Float(), nullable=False),
+    sa.Column('ratings_count', sa.Integer(), nullable=False),
+    sa.Column('weighted_rating', sa.Float(), nullable=False),
+    sa.Column('trending_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('movie_id')
+    )
+    op.create_index('ix_movie_rankings_average_rating_movie_id', 'movie_rankings', ['average_rating', 'movie_id'], unique=False)
+    op.create_index('ix_movie_rankings_ratings_count_movie_id', 'movie_rankings', ['ratings_count', 'movie_id'], unique=False)
+    op.create_index('ix_movie_rankings_weighted_rating_movie_id', 'movie_rankings', ['weighted_rating', 'movie_id'], unique=False)
+    op.create_index('ix_movie_rankings_trending_count_movie_id', 'movie_rankings', ['trending_count', 'movie_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_rankings_trending_count_movie_id', table_name='movie_rankings')
+    op.drop_index('ix_movie_rankings_weighted_rating_movie_id', table_name='movie_rankings')
+    op.drop_index('ix_movie_rankings_ratings_count_movie_id', table_name='movie_rankings')
+    op.drop_index('ix_movie_rankings_average_rating_movie_id', table_name='movie_rankings')
+    op.drop_table('movie_rankings')
+    op.drop_index('ix_movie_rating_daily_day', table_name='movie_rating_daily')
+    op.drop_table('movie_rating_daily')
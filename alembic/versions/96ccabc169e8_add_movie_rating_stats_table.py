@@ -0,0 +1,43 @@
+"""Add movie_rating_stats table
+
+Revision ID: 96ccabc169e8
+Revises: 66576f467d9b
+Create Date: 2026-10-18 10:02:11.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '96ccabc169e8'
+down_revision: Union[str, Sequence[str], None] = '66576f467d9b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCORE_COLUMNS = [f'score_{score}' for score in range(1, 11)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('movie_rating_stats',
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('ratings_sum', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('ratings_count', sa.Integer(), server_default='0', nullable=False),
+    *[sa.Column(column, sa.Integer(), server_default='0', nullable=False) for column in SCORE_COLUMNS],
+    sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('movie_id')
+    )
+    # Backfill aggregates for ratings that already exist
+    histogram = ', '.join(f'COUNT(*) FILTER (WHERE score = {score})' for score in range(1, 11))
+    op.execute(
+        f"INSERT INTO movie_rating_stats (movie_id, ratings_sum, ratings_count, {', '.join(SCORE_COLUMNS)}) "
+        f"SELECT movie_id, SUM(score), COUNT(*), {histogram} FROM movie_ratings GROUP BY movie_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('movie_rating_stats')
@@ -0,0 +1,36 @@
+"""Add foreign key and filter indexes
+
+Revision ID: d9322b4623a1
+Revises: 50a6d2478134
+Create Date: 2026-10-18 11:52:08.240117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9322b4623a1'
+down_revision: Union[str, Sequence[str], None] = '50a6d2478134'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, and does not lock out writes
+    with op.get_context().autocommit_block():
+        op.create_index('ix_movie_ratings_movie_id_score', 'movie_ratings', ['movie_id', 'score'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_movies_director_id'), 'movies', ['director_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_movies_release_year_id', 'movies', ['release_year', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_movie_genres_genre_id', 'movie_genres', ['genre_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_movie_genres_genre_id', table_name='movie_genres', postgresql_concurrently=True)
+        op.drop_index('ix_movies_release_year_id', table_name='movies', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_movies_director_id'), table_name='movies', postgresql_concurrently=True)
+        op.drop_index('ix_movie_ratings_movie_id_score', table_name='movie_ratings', postgresql_concurrently=True)
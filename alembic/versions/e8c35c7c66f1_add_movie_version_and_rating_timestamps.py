@@ -0,0 +1,37 @@
+"""Add movie version and rating timestamps
+
+Revision ID: e8c35c7c66f1
+Revises: d9322b4623a1
+Create Date: 2026-10-18 13:40:26.115930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c35c7c66f1'
+down_revision: Union[str, Sequence[str], None] = 'd9322b4623a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('movies', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.add_column('movie_rating_stats', sa.Column('last_rated_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE movie_rating_stats SET last_rated_at = latest.rated_at "
+        "FROM (SELECT movie_id, MAX(rated_at) AS rated_at FROM movie_ratings GROUP BY movie_id) AS latest "
+        "WHERE movie_rating_stats.movie_id = latest.movie_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('movie_rating_stats', 'last_rated_at')
+    op.drop_column('movies', 'updated_at')
+    op.drop_column('movies', 'version')
@@ -0,0 +1,38 @@
+from typing import Optional
+from app.cache.backend import CacheBackend, InMemoryCache
+from app.cache.movie import MovieCache
+from app.cache.movie_ids import KnownMovieIds
+from app.cache.reference import DirectorCache, GenreCache
+from app.config import settings
+
+movie_cache: Optional[MovieCache] = (
+    MovieCache(
+        InMemoryCache(max_entries=settings.CACHE_MAX_ENTRIES, default_ttl=settings.CACHE_TTL_SECONDS),
+        replica_lag=settings.CACHE_REPLICA_LAG_SECONDS if settings.replica_urls else 0.0,
+    )
+    if settings.CACHE_ENABLED
+    else None
+)
+
+known_movie_ids: Optional[KnownMovieIds] = KnownMovieIds(max_entries=settings.KNOWN_MOVIE_IDS_MAX_ENTRIES) if settings.CACHE_ENABLED else None
+
+genre_cache: Optional[GenreCache] = GenreCache(ttl=settings.REFERENCE_CACHE_TTL_SECONDS) if settings.CACHE_ENABLED else None
+
+director_cache: Optional[DirectorCache] = (
+    DirectorCache(InMemoryCache(max_entries=settings.DIRECTOR_CACHE_MAX_ENTRIES, default_ttl=settings.REFERENCE_CACHE_TTL_SECONDS))
+    if settings.CACHE_ENABLED
+    else None
+)
+
+__all__ = [
+    "CacheBackend",
+    "InMemoryCache",
+    "MovieCache",
+    "KnownMovieIds",
+    "GenreCache",
+    "DirectorCache",
+    "movie_cache",
+    "known_movie_ids",
+    "genre_cache",
+    "director_cache",
+]
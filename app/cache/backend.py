@@ -0,0 +1,130 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class CacheBackend(ABC):
+    """Interface for cache stores. A shared store (e.g. Redis) can replace InMemoryCache by implementing it."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically advance a version counter, returning a value it has never had before."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        """Current value of a version counter.
+
+        Counters may be evicted; a missing counter reads as a value it has never had before, so
+        eviction can only invalidate entries keyed on it, never resurrect stale ones.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class InMemoryCache(CacheBackend):
+    """Process-local LRU cache with per-entry TTL, bounded by entry count. Thread-safe.
+
+    Version counters are kept in a second LRU of the same size. Their values come from one
+    process-wide sequence, so a counter that was evicted restarts above every value it had.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._counters: OrderedDict[str, int] = OrderedDict()
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            return self._set_counter(key)
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key)
+            if value is None:
+                return self._set_counter(key)
+            self._counters.move_to_end(key)
+            return value
+
+    def _set_counter(self, key: str) -> int:
+        self._sequence += 1
+        self._counters[key] = self._sequence
+        self._counters.move_to_end(key)
+        while len(self._counters) > self.max_entries:
+            self._counters.popitem(last=False)
+        return self._sequence
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "counters": len(self._counters),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,70 @@
+from typing import Any, Optional
+from app.cache.backend import CacheBackend
+
+LIST_GENERATION_KEY = "movies:list:generation"
+LIST_WRITTEN_KEY = "movies:list:written"
+
+
+class MovieCache:
+    """Caches movie detail and list responses.
+
+    Keys embed a version counter: a movie's detail key carries that movie's version, and list keys
+    carry a generation shared by all list pages. Invalidation bumps the counters, so every affected
+    entry becomes unreachable at once and ages out of the LRU. Callers build the key *before*
+    reading from the database, so a response computed concurrently with a write is stored under
+    the superseded key and is never served.
+
+    That only holds for reads from the primary: a replica may still return pre-write data after the
+    version was bumped. For `replica_lag` seconds after an invalidation, values read from a replica
+    are therefore not stored (see `set`).
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: Optional[float] = None, replica_lag: float = 0.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.replica_lag = replica_lag
+
+    def detail_key(self, movie_id: int) -> str:
+        version = self.backend.get_counter(f"movies:version:{movie_id}")
+        return f"movies:detail:{movie_id}:{version}"
+
+    def list_key(self, params: dict[str, Any]) -> str:
+        generation = self.backend.get_counter(LIST_GENERATION_KEY)
+        normalized = "&".join(f"{name}={params[name]}" for name in sorted(params) if params[name] is not None)
+        return f"movies:list:{generation}:{normalized}"
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.backend.get(key)
+
+    def set(self, key: str, value: Any, movie_id: Optional[int] = None, from_replica: bool = False) -> None:
+        """Store a value built from the database. With from_replica, it is dropped if its movie (or, for
+        list pages with movie_id=None, any list) was invalidated within the last `replica_lag` seconds."""
+        if from_replica and self.replica_lag and self.backend.get(self._written_key(movie_id)) is not None:
+            return
+        self.backend.set(key, value, self.ttl)
+
+    def invalidate_movie(self, movie_id: int, lists: bool = True) -> None:
+        """Invalidate the movie's detail entries and, with `lists`, every list page.
+
+        Rating writes pass lists=False: the average and count shown in list pages then catch up
+        when those pages expire (after the TTL), instead of every rating emptying the list cache.
+        """
+        self.backend.delete(self.detail_key(movie_id))
+        self.backend.incr(f"movies:version:{movie_id}")
+        self._mark_written(movie_id)
+        if lists:
+            self.invalidate_lists()
+
+    def invalidate_lists(self) -> None:
+        self.backend.incr(LIST_GENERATION_KEY)
+        self._mark_written(None)
+
+    def _written_key(self, movie_id: Optional[int]) -> str:
+        return LIST_WRITTEN_KEY if movie_id is None else f"movies:written:{movie_id}"
+
+    def _mark_written(self, movie_id: Optional[int]) -> None:
+        if self.replica_lag:
+            self.backend.set(self._written_key(movie_id), True, self.replica_lag)
+
+    def stats(self) -> dict:
+        return self.backend.stats()
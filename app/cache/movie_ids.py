@@ -0,0 +1,36 @@
+import threading
+
+
+class KnownMovieIds:
+    """Per-process set of movie ids known to exist, so hot write paths can skip the existence query.
+
+    It only ever answers "known to exist": a miss falls back to the database, and a stale hit
+    (movie deleted by another process) is caught by the movie_ratings foreign key.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._ids: set[int] = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, movie_id: int) -> bool:
+        return movie_id in self._ids
+
+    def add(self, movie_id: int) -> None:
+        with self._lock:
+            if len(self._ids) < self.max_entries:
+                self._ids.add(movie_id)
+
+    def update(self, movie_ids: set[int]) -> None:
+        with self._lock:
+            for movie_id in movie_ids:
+                if len(self._ids) >= self.max_entries:
+                    break
+                self._ids.add(movie_id)
+
+    def discard(self, movie_id: int) -> None:
+        with self._lock:
+            self._ids.discard(movie_id)
+
+    def stats(self) -> dict:
+        return {"size": len(self._ids), "max_entries": self.max_entries}
@@ -0,0 +1,76 @@
+import threading
+import time
+from typing import Iterable, NamedTuple, Optional
+from app.cache.backend import CacheBackend
+from app.schemas.director import DirectorDetail
+
+
+class GenreSnapshot(NamedTuple):
+    version: int
+    names_by_id: dict[int, str]
+    ids_by_name: dict[str, int]
+    expires_at: float
+
+
+class GenreCache:
+    """Per-process copy of the genres table, as id <-> name maps.
+
+    Each load publishes a new immutable snapshot with a higher version, so readers never lock and
+    always see one consistent table. A snapshot expires after `ttl` seconds (genres may be changed by
+    another process); `invalidate()` drops it at once. Callers reload from the database when
+    `snapshot()` returns None, and treat a lookup miss as "ask the database".
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshot: Optional[GenreSnapshot] = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def snapshot(self) -> Optional[GenreSnapshot]:
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.expires_at < time.monotonic():
+            return None
+        return snapshot
+
+    def load(self, genres: Iterable[tuple[int, str]]) -> GenreSnapshot:
+        names_by_id = dict(genres)
+        ids_by_name = {name: genre_id for genre_id, name in names_by_id.items()}
+        with self._lock:
+            self._version += 1
+            self._snapshot = GenreSnapshot(self._version, names_by_id, ids_by_name, time.monotonic() + self.ttl)
+            self.loads += 1
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "genres": len(snapshot.names_by_id) if snapshot else 0,
+            "loads": self.loads,
+            "ttl_seconds": self.ttl,
+        }
+
+
+class DirectorCache:
+    """Bounded LRU of directors by id, holding the detail shape embedded in movie responses."""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    def get(self, director_id: int) -> Optional[DirectorDetail]:
+        return self.backend.get(f"directors:{director_id}")
+
+    def set(self, director: DirectorDetail) -> None:
+        self.backend.set(f"directors:{director.id}", director)
+
+    def invalidate(self, director_id: int) -> None:
+        self.backend.delete(f"directors:{director_id}")
+
+    def stats(self) -> dict:
+        return self.backend.stats()
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,11 +12,96 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # Use the asyncpg driver with AsyncSession instead of psycopg2 for request handling
+    DB_ASYNC: bool = False
+    # Defaults to DATABASE_URL with the asyncpg driver
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Comma-separated read replica URLs; read-only endpoints are spread across them
+    DATABASE_REPLICA_URLS: str = ""
+    # After a client writes, route its reads to the primary for this many seconds (0 disables)
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 0
+    # Upper bound on replica lag: cache entries read from a replica this soon after a write to them are not stored
+    CACHE_REPLICA_LAG_SECONDS: float = 5.0
+
+    # Connection pool (per engine)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT: float = 30.0
+    # Recycle connections older than this many seconds (-1 disables)
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    # Server-side statement_timeout in milliseconds (0 disables)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    # Prometheus text metrics at GET /metrics
+    METRICS_ENABLED: bool = True
+
+    # Per-request statement count and DB time (Server-Timing header and request log)
+    QUERY_STATS_ENABLED: bool = True
+    # Answer 500 instead of logging a warning when a route exceeds its declared query budget (tests/dev)
+    QUERY_BUDGET_STRICT: bool = False
+
+    # Response cache for movie detail and list endpoints (per process)
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_TTL_SECONDS: float = 30.0
+    # Movie ids remembered as existing, so rating writes skip the existence query
+    KNOWN_MOVIE_IDS_MAX_ENTRIES: int = 1000000
+    # Genres (id <-> name) and directors kept in memory for movie writes and the genre filter; reloaded after the TTL
+    REFERENCE_CACHE_TTL_SECONDS: float = 300.0
+    DIRECTOR_CACHE_MAX_ENTRIES: int = 10000
+
+    # max-age (seconds) sent in Cache-Control for movie GET responses; clients revalidate with ETags after it
+    HTTP_CACHE_MAX_AGE: int = 0
+
+    # Items written per transaction by POST /api/v1/ratings/bulk
+    BULK_RATING_CHUNK_SIZE: int = 5000
+    # Movies inserted per transaction by POST /api/v1/movies/import, and rows per fetch/chunk of the export
+    MOVIE_IMPORT_CHUNK_SIZE: int = 1000
+    MOVIE_EXPORT_BATCH_SIZE: int = 1000
+    # Rows per server-side cursor fetch (and per chunk) of GET /api/v1/movies/{movie_id}/ratings?format=ndjson
+    RATING_STREAM_BATCH_SIZE: int = 5000
+
+    # Leaderboard sorts of GET /api/v1/movies read movie_rankings, refreshed by a background thread
+    # every RANKING_REFRESH_INTERVAL_SECONDS (0 disables it; run scripts/refresh_rankings.py instead)
+    RANKING_REFRESH_INTERVAL_SECONDS: float = 60
+    # Bayesian prior weight (in votes) of the global mean in the weighted rating
+    RANKING_MIN_VOTES: int = 25
+    RANKING_TRENDING_DAYS: int = 7
+
+    # Write-behind ratings: POST /ratings returns 202 and a background thread commits in batches
+    RATING_WRITE_BEHIND: bool = False
+    RATING_BUFFER_MAX_SIZE: int = 10000
+    RATING_BUFFER_BATCH_SIZE: int = 500
+    RATING_BUFFER_FLUSH_INTERVAL_MS: int = 50
+    # False commits flushed batches with synchronous_commit=off (faster, may lose the last batches on a crash)
+    RATING_BUFFER_SYNCHRONOUS_COMMIT: bool = True
+
+    # Logging: "json" or "text"; INFO/DEBUG records are kept with probability LOG_INFO_SAMPLE_RATE
+    LOG_FORMAT: str = "json"
+    LOG_LEVEL: str = "INFO"
+    LOG_INFO_SAMPLE_RATE: float = 1.0
 
     # Application
     APP_NAME: str = "Movie Rating System"
     DEBUG: bool = False
 
+    @property
+    def async_database_url(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        return to_async_url(self.DATABASE_URL)
+
+    @property
+    def replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
 
-settings = Settings()
 
+def to_async_url(url: str) -> str:
+    """Swap a PostgreSQL URL's driver for asyncpg."""
+    scheme, _, rest = url.partition("://")
+    return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgresql") else url
+
+
+settings = Settings()
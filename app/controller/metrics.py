@@ -0,0 +1,83 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.cache import director_cache, genre_cache, known_movie_ids, movie_cache
+from app.db.session import engine_pool_stats
+from app.metrics import CollectedMetric, registry
+from app.services.rating_buffer import rating_buffer
+from app.services.ranking_refresher import ranking_refresher
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+POOL_GAUGES = {
+    "size": "Configured pool size.",
+    "checked_out": "Connections currently checked out.",
+    "overflow": "Overflow connections currently open.",
+    "waiting": "Requests waiting for a connection.",
+}
+POOL_COUNTERS = {
+    "checkouts": "Connection checkouts.",
+    "checkout_timeouts": "Checkouts that timed out.",
+    "wait_seconds_total": "Total time spent waiting for a connection, in seconds.",
+}
+
+
+def _pool_metrics() -> list[CollectedMetric]:
+    pools = engine_pool_stats()
+    metrics = []
+    for key, documentation in POOL_GAUGES.items():
+        samples = [({"pool": name}, stats[key]) for name, stats in pools.items() if key in stats]
+        metrics.append(CollectedMetric(f"db_pool_{key}", documentation, "gauge", samples))
+    for key, documentation in POOL_COUNTERS.items():
+        samples = [({"pool": name}, stats[key]) for name, stats in pools.items() if key in stats]
+        metrics.append(CollectedMetric(f"db_pool_{key.removesuffix('_total')}_total", documentation, "counter", samples))
+    return metrics
+
+
+def _cache_metrics() -> list[CollectedMetric]:
+    metrics = []
+    caches = {name: cache.stats() for name, cache in (("movies", movie_cache), ("directors", director_cache)) if cache is not None}
+    if caches:
+        metrics.append(CollectedMetric("cache_hits_total", "Cache hits.", "counter", [({"cache": name}, stats["hits"]) for name, stats in caches.items()]))
+        metrics.append(CollectedMetric("cache_misses_total", "Cache misses.", "counter", [({"cache": name}, stats["misses"]) for name, stats in caches.items()]))
+        metrics.append(CollectedMetric("cache_evictions_total", "Cache LRU evictions.", "counter", [({"cache": name}, stats["evictions"]) for name, stats in caches.items()]))
+        metrics.append(CollectedMetric("cache_entries", "Cache entries.", "gauge", [({"cache": name}, stats["entries"]) for name, stats in caches.items()]))
+    if known_movie_ids is not None:
+        metrics.append(CollectedMetric("known_movie_ids", "Movie ids remembered as existing.", "gauge", [({}, known_movie_ids.stats()["size"])]))
+    if genre_cache is not None:
+        metrics.append(CollectedMetric("genre_cache_loads_total", "Loads of the genre table into the reference cache.", "counter", [({}, genre_cache.stats()["loads"])]))
+    return metrics
+
+
+def _rating_buffer_metrics() -> list[CollectedMetric]:
+    if rating_buffer is None:
+        return []
+    stats = rating_buffer.stats()
+    return [
+        CollectedMetric("rating_buffer_pending", "Ratings queued and not yet committed.", "gauge", [({}, stats["pending"])]),
+        CollectedMetric("rating_buffer_rejected_total", "Ratings refused because the buffer was full.", "counter", [({}, stats["rejected"])]),
+        CollectedMetric("rating_buffer_dropped_total", "Queued ratings that could not be committed.", "counter", [({}, stats["dropped"])]),
+        CollectedMetric("rating_buffer_batches_total", "Batches committed by the buffer.", "counter", [({}, stats["batches"])]),
+    ]
+
+
+def _ranking_metrics() -> list[CollectedMetric]:
+    if ranking_refresher is None:
+        return []
+    stats = ranking_refresher.stats()
+    return [
+        CollectedMetric("ranking_refreshes_total", "Completed movie ranking refreshes.", "counter", [({}, stats["refreshes"])]),
+        CollectedMetric("ranking_refresh_failures_total", "Movie ranking refreshes that failed.", "counter", [({}, stats["failures"])]),
+    ]
+
+
+registry.add_collector(_pool_metrics)
+registry.add_collector(_cache_metrics)
+registry.add_collector(_rating_buffer_metrics)
+registry.add_collector(_ranking_metrics)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
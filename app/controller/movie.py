@@ -1,52 +1,137 @@
+import itertools
 import logging
-from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from typing import Any, Iterator, Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.db.session import open_read_session
 from app.services.movie import MovieService
-from app.services.dependencies import get_movie_service
-from app.schemas.movie import MovieCreate, MovieUpdate
+from app.services.movie_export import iter_movie_export
+from app.services.dependencies import get_movie_service, get_movie_read_service
+from app.services.runner import ServiceRunner
+from app.schemas.movie import MovieCreate, MovieUpdate, MovieSort, CountMode, MovieImportResult
+from app.utils.query_budget import query_budget
 from app.utils.response import success_response, empty_response
+from app.utils.streaming import CSV_CONTENT_TYPES, NDJSON_CONTENT_TYPES, content_type, iter_chunks, iter_csv, iter_json_array, iter_ndjson
+from app.utils.http_cache import etag_for_body, is_not_modified, not_modified_response, with_cache_headers
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
-@router.get("", response_model=None)
-def get_movies(
+
+def _csv_movie_item(record: dict[str, str]) -> dict[str, Any]:
+    """Map a CSV record onto the import item shape: empty cells are omitted, genres are `;`-separated ids."""
+    item: dict[str, Any] = {name: value for name, value in record.items() if value != ""}
+    if "genres" in item:
+        item["genres"] = [genre.strip() for genre in item["genres"].replace("|", ";").split(";") if genre.strip()]
+    return item
+
+
+async def _iter_csv_movie_items(request: Request):
+    async for record in iter_csv(request):
+        yield _csv_movie_item(record)
+
+
+def _stream_export(db: Session, export_format: str) -> Iterator[bytes]:
+    try:
+        yield from iter_movie_export(db, export_format, settings.MOVIE_EXPORT_BATCH_SIZE)
+    finally:
+        db.close()
+
+
+@router.get("", response_model=None, dependencies=[Depends(query_budget(4))])
+async def get_movies(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     title: Optional[str] = Query(None),
     release_year: Optional[int] = Query(None),
     genre: Optional[str] = Query(None),
-    service: MovieService = Depends(get_movie_service),
+    sort: MovieSort = Query("id"),
+    cursor: Optional[str] = Query(None),
+    count: CountMode = Query("exact"),
+    service: ServiceRunner[MovieService] = Depends(get_movie_read_service),
 ):
-    logger.info(f"Fetching movies list (route=/api/v1/movies, page={page}, page_size={page_size})")
+    logger.info("Fetching movies list (route=/api/v1/movies, page=%s, page_size=%s)", page, page_size)
     try:
-        result = service.get_movie_list(page=page, page_size=page_size, title=title, release_year=release_year, genre=genre)
-        return success_response(data=result.model_dump())
+        result = await service.get_movie_list(
+            page=page, page_size=page_size, title=title, release_year=release_year, genre=genre, sort=sort, cursor=cursor, count=count
+        )
+        response = success_response(data=result)
+        etag = etag_for_body(response.body)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        return with_cache_headers(response, etag)
     except Exception as e:
-        logger.error(f"Failed to fetch movies list (route=/api/v1/movies, page={page}, page_size={page_size})", exc_info=True)
+        logger.error("Failed to fetch movies list (route=/api/v1/movies, page=%s, page_size=%s)", page, page_size, exc_info=True)
         raise
 
 
-@router.get("/{movie_id}", response_model=None)
-def get_movie(movie_id: int, service: MovieService = Depends(get_movie_service)):
-    result = service.get_movie_by_id(movie_id)
-    return success_response(data=result.model_dump())
+@router.post("/import", response_model=None)
+async def import_movies(request: Request, service: ServiceRunner[MovieService] = Depends(get_movie_service)):
+    """Bulk-create movies from a JSON array, NDJSON or CSV body, one transaction per chunk."""
+    body_type = content_type(request)
+    if body_type in NDJSON_CONTENT_TYPES:
+        items = iter_ndjson(request)
+    elif body_type in CSV_CONTENT_TYPES:
+        items = _iter_csv_movie_items(request)
+    else:
+        items = iter_json_array(request)
+    logger.info("Movie import started (content_type=%s, route=/api/v1/movies/import)", body_type or "unknown")
+
+    result = MovieImportResult()
+    start_index = 0
+    async for chunk in iter_chunks(items, settings.MOVIE_IMPORT_CHUNK_SIZE):
+        chunk_result = await service.import_movies(chunk, start_index)
+        result.accepted += chunk_result.accepted
+        result.rejected += chunk_result.rejected
+        result.errors.extend(chunk_result.errors)
+        start_index += len(chunk)
+
+    logger.info("Movie import finished (accepted=%s, rejected=%s)", result.accepted, result.rejected)
+    return success_response(data=result)
+
+
+# Declared before /{movie_id} so "export" is not parsed as a movie id
+@router.get("/export", response_model=None)
+async def export_movies(request: Request, format: Literal["ndjson", "csv"] = Query("ndjson")):
+    """Stream the whole catalogue through a server-side cursor, in constant memory."""
+    stream = _stream_export(open_read_session(request), format)
+    # Run the query before the response starts, so a failure is still reported as an error response
+    first_chunk = await run_in_threadpool(next, stream, b"")
+    return StreamingResponse(
+        itertools.chain([first_chunk], stream),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="movies.{format}"'},
+    )
+
+
+@router.get("/{movie_id}", response_model=None, dependencies=[Depends(query_budget(2))])
+async def get_movie(movie_id: int, request: Request, service: ServiceRunner[MovieService] = Depends(get_movie_read_service)):
+    etag, last_modified = await service.get_movie_validators(movie_id)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    result = await service.get_movie_by_id(movie_id)
+    return with_cache_headers(success_response(data=result), etag, last_modified)
 
 
-@router.post("", response_model=None, status_code=201)
-def create_movie(movie_data: MovieCreate, service: MovieService = Depends(get_movie_service)):
-    result = service.create_movie(movie_data)
-    return success_response(data=result.model_dump(), status_code=201)
+@router.post("", response_model=None, status_code=201, dependencies=[Depends(query_budget(8))])
+async def create_movie(movie_data: MovieCreate, service: ServiceRunner[MovieService] = Depends(get_movie_service)):
+    result = await service.create_movie(movie_data)
+    return success_response(data=result, status_code=201)
 
 
-@router.put("/{movie_id}", response_model=None)
-def update_movie(movie_id: int, movie_data: MovieUpdate, service: MovieService = Depends(get_movie_service)):
-    result = service.update_movie(movie_id, movie_data)
-    return success_response(data=result.model_dump())
+@router.put("/{movie_id}", response_model=None, dependencies=[Depends(query_budget(4))])
+async def update_movie(movie_id: int, movie_data: MovieUpdate, service: ServiceRunner[MovieService] = Depends(get_movie_service)):
+    result = await service.update_movie(movie_id, movie_data)
+    return success_response(data=result)
 
 
-@router.delete("/{movie_id}", response_model=None, status_code=204)
-def delete_movie(movie_id: int, service: MovieService = Depends(get_movie_service)):
-    service.delete_movie(movie_id)
+@router.delete("/{movie_id}", response_model=None, status_code=204, dependencies=[Depends(query_budget(3))])
+async def delete_movie(movie_id: int, service: ServiceRunner[MovieService] = Depends(get_movie_service)):
+    await service.delete_movie(movie_id)
     return empty_response()
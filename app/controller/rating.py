@@ -1,16 +1,77 @@
+import itertools
 import logging
-from fastapi import APIRouter, Depends
-from app.services.rating import RatingService
-from app.services.dependencies import get_rating_service
-from app.schemas.rating import RatingCreate
+from datetime import date, datetime
+from typing import Iterator, Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.db.session import open_read_session
+from app.services.rating import RatingService, decode_rating_cursor
+from app.services.rating_export import iter_movie_ratings_ndjson
+from app.services.dependencies import get_rating_service, get_rating_read_service
+from app.services.runner import ServiceRunner
+from app.schemas.rating import RatingCreate, RatingAcceptedResponse, RatingOrder, StatsInterval
+from app.utils.http_cache import etag_for_body, is_not_modified, not_modified_response, with_cache_headers
+from app.utils.query_budget import query_budget
 from app.utils.response import success_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.post("", response_model=None, status_code=201)
-def create_rating(rating_data: RatingCreate, movie_id: int, service: RatingService = Depends(get_rating_service)):
-    logger.info(f"Rating movie (movie_id={movie_id}, rating={rating_data.score}, route=/api/v1/movies/{movie_id}/ratings)")
-    result = service.create_rating(movie_id, rating_data)
-    return success_response(data=result.model_dump(), status_code=201)
+def _stream_ratings(db: Session, movie_id: int, descending: bool, after: Optional[tuple[datetime, int]]) -> Iterator[bytes]:
+    try:
+        yield from iter_movie_ratings_ndjson(db, movie_id, descending, after, settings.RATING_STREAM_BATCH_SIZE)
+    finally:
+        db.close()
+
+
+@router.post("", response_model=None, status_code=201, dependencies=[Depends(query_budget(4))])
+async def create_rating(rating_data: RatingCreate, movie_id: int, service: ServiceRunner[RatingService] = Depends(get_rating_service)):
+    logger.info("Rating movie (movie_id=%s, rating=%s, route=/api/v1/movies/%s/ratings)", movie_id, rating_data.score, movie_id)
+    result = await service.create_rating(movie_id, rating_data)
+    status_code = 202 if isinstance(result, RatingAcceptedResponse) else 201
+    return success_response(data=result, status_code=status_code)
+
+
+@router.get("", response_model=None, dependencies=[Depends(query_budget(2))])
+async def get_ratings(
+    movie_id: int,
+    request: Request,
+    page_size: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    order: RatingOrder = Query("desc"),
+    format: Literal["json", "ndjson"] = Query("json"),
+    service: ServiceRunner[RatingService] = Depends(get_rating_read_service),
+):
+    """A page of the movie's ratings by keyset over (rated_at, id), or all of them streamed as NDJSON."""
+    if format == "json":
+        result = await service.get_movie_ratings(movie_id, page_size=page_size, cursor=cursor, order=order)
+        return success_response(data=result)
+
+    after = decode_rating_cursor(cursor, order)
+    stream = _stream_ratings(open_read_session(request), movie_id, order == "desc", after)
+    # Check the movie and run the query before the response starts, so failures are still reported as error responses
+    first_chunk = await run_in_threadpool(next, stream, b"")
+    return StreamingResponse(itertools.chain([first_chunk], stream), media_type="application/x-ndjson")
+
+
+@router.get("/stats", response_model=None, dependencies=[Depends(query_budget(3))])
+async def get_rating_stats(
+    movie_id: int,
+    request: Request,
+    interval: StatsInterval = Query("day"),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    window: Optional[int] = Query(None, ge=1, le=365),
+    service: ServiceRunner[RatingService] = Depends(get_rating_read_service),
+):
+    """Rating histograms and daily/weekly buckets with rolling averages, read from the daily rollup."""
+    result = await service.get_rating_stats(movie_id, interval=interval, start=start, end=end, window=window)
+    response = success_response(data=result)
+    etag = etag_for_body(response.body)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    return with_cache_headers(response, etag)
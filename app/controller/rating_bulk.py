@@ -0,0 +1,31 @@
+import logging
+from fastapi import APIRouter, Depends, Request
+from app.config import settings
+from app.schemas.rating import BulkRatingResult
+from app.services.rating import RatingService
+from app.services.dependencies import get_rating_service
+from app.services.runner import ServiceRunner
+from app.utils.response import success_response
+from app.utils.streaming import NDJSON_CONTENT_TYPES, content_type, iter_chunks, iter_json_array, iter_ndjson
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.post("/bulk", response_model=None)
+async def bulk_create_ratings(request: Request, service: ServiceRunner[RatingService] = Depends(get_rating_service)):
+    body_type = content_type(request)
+    items = iter_ndjson(request) if body_type in NDJSON_CONTENT_TYPES else iter_json_array(request)
+    logger.info("Bulk rating ingestion started (content_type=%s, route=/api/v1/ratings/bulk)", body_type or "unknown")
+
+    result = BulkRatingResult()
+    start_index = 0
+    async for chunk in iter_chunks(items, settings.BULK_RATING_CHUNK_SIZE):
+        chunk_result = await service.ingest_ratings(chunk, start_index)
+        result.accepted += chunk_result.accepted
+        result.rejected += chunk_result.rejected
+        result.errors.extend(chunk_result.errors)
+        start_index += len(chunk)
+
+    logger.info("Bulk rating ingestion finished (accepted=%s, rejected=%s)", result.accepted, result.rejected)
+    return success_response(data=result)
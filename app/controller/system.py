@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from app.cache import director_cache, genre_cache, known_movie_ids, movie_cache
+from app.db.session import engine_pool_stats
+from app.services.rating_buffer import rating_buffer
+from app.services.ranking_refresher import ranking_refresher
+from app.utils.response import success_response
+
+router = APIRouter()
+
+
+@router.get("/pool", response_model=None)
+async def get_pool_stats():
+    return success_response(data=engine_pool_stats())
+
+
+@router.get("/cache", response_model=None)
+async def get_cache_stats():
+    return success_response(
+        data={
+            "movies": movie_cache.stats() if movie_cache is not None else None,
+            "known_movie_ids": known_movie_ids.stats() if known_movie_ids is not None else None,
+            "genres": genre_cache.stats() if genre_cache is not None else None,
+            "directors": director_cache.stats() if director_cache is not None else None,
+        }
+    )
+
+
+@router.get("/rating-buffer", response_model=None)
+async def get_rating_buffer_stats():
+    return success_response(data=rating_buffer.stats() if rating_buffer is not None else None)
+
+
+@router.get("/rankings", response_model=None)
+async def get_ranking_stats():
+    return success_response(data=ranking_refresher.stats() if ranking_refresher is not None else None)
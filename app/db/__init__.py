@@ -1,5 +1,29 @@
 from app.db.base import Base
-from app.db.session import engine, SessionLocal, get_db
-
-__all__ = ["Base", "engine", "SessionLocal", "get_db"]
+from app.db.session import (
+    engine,
+    SessionLocal,
+    get_db,
+    get_read_db,
+    open_read_session,
+    async_engine,
+    AsyncSessionLocal,
+    get_async_db,
+    get_async_read_db,
+    get_request_db,
+    get_request_read_db,
+)
 
+__all__ = [
+    "Base",
+    "engine",
+    "SessionLocal",
+    "get_db",
+    "get_read_db",
+    "open_read_session",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
+    "get_async_read_db",
+    "get_request_db",
+    "get_request_read_db",
+]
@@ -0,0 +1,8 @@
+from sqlalchemy.exc import IntegrityError
+
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    """True when the driver reports SQLSTATE 23503 (works for psycopg2 and asyncpg)."""
+    return getattr(error.orig, "pgcode", None) == FOREIGN_KEY_VIOLATION
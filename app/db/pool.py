@@ -0,0 +1,81 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Counters describing how long requests wait to check out a connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def start_wait(self) -> None:
+        with self._lock:
+            self.waiting += 1
+
+    def end_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waiting -= 1
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class _InstrumentedPoolMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        self.metrics.start_wait()
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.end_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        except BaseException:
+            self.metrics.end_wait(time.perf_counter() - start)
+            raise
+        self.metrics.end_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(pool) -> dict:
+    """Snapshot of a pool's occupancy and, for instrumented pools, its checkout wait metrics."""
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(
+            checkouts=metrics.checkouts,
+            checkout_timeouts=metrics.timeouts,
+            waiting=metrics.waiting,
+            wait_seconds_total=round(metrics.wait_seconds_total, 6),
+            wait_seconds_avg=round(metrics.wait_seconds_total / metrics.checkouts, 6) if metrics.checkouts else 0.0,
+            wait_seconds_max=round(metrics.wait_seconds_max, 6),
+        )
+    return stats
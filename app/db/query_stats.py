@@ -0,0 +1,65 @@
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """Statements executed and time spent in the database during one request."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.budget: Optional[int] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+
+# A mutable object, so increments made in worker threads and greenlets reach the request
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def begin_query_stats() -> tuple[QueryStats, Token]:
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def end_query_stats(token: Token) -> None:
+    _current_stats.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute; drop their start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record every statement the engine (or an AsyncEngine's sync_engine) runs into the current QueryStats."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
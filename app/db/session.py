@@ -1,14 +1,127 @@
+import itertools
+import time
+from typing import Any, AsyncIterator, Iterator
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from app.config import settings
+from app.config import settings, to_async_url
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, pool_stats
+from app.db.query_stats import instrument_engine
 
-engine = create_engine(settings.DATABASE_URL, echo=False)
+
+def _engine_options(is_async: bool = False) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "echo": False,
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(settings.async_database_url, **_engine_options(is_async=True)) if settings.DB_ASYNC else None
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False) if async_engine is not None else None
+
+replica_engines = [create_engine(url, **_engine_options()) for url in settings.replica_urls]
+async_replica_engines = (
+    [create_async_engine(to_async_url(url), **_engine_options(is_async=True)) for url in settings.replica_urls] if settings.DB_ASYNC else []
+)
+
+if settings.QUERY_STATS_ENABLED:
+    for _engine in [engine, *replica_engines]:
+        instrument_engine(_engine)
+    for _async_engine in ([async_engine] if async_engine is not None else []) + async_replica_engines:
+        instrument_engine(_async_engine.sync_engine)
+
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+_async_replica_cycle = itertools.cycle(async_replica_engines) if async_replica_engines else None
+# Sync engines that serve replica sessions (an AsyncSession's run_sync side binds to sync_engine)
+_replica_binds = {*replica_engines, *(replica.sync_engine for replica in async_replica_engines)}
+
+
+def engine_pool_stats() -> dict[str, dict]:
+    """pool_stats for every engine, keyed sync / async / replica_N / async_replica_N."""
+    pools = {"sync": pool_stats(engine.pool)}
+    if async_engine is not None:
+        pools["async"] = pool_stats(async_engine.sync_engine.pool)
+    for index, replica in enumerate(replica_engines):
+        pools[f"replica_{index}"] = pool_stats(replica.pool)
+    for index, replica in enumerate(async_replica_engines):
+        pools[f"async_replica_{index}"] = pool_stats(replica.sync_engine.pool)
+    return pools
 
-def get_db() -> Session:
+
+# Set by the read-your-writes middleware after a successful write (unix timestamp)
+LAST_WRITE_COOKIE = "last_write_at"
+
+
+def get_db() -> Iterator[Session]:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _read_from_primary(request: Request) -> bool:
+    """Whether this client wrote recently enough that a lagging replica could hide its write."""
+    if not settings.REPLICA_READ_YOUR_WRITES_SECONDS:
+        return False
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        return False
+    return time.time() - last_write < settings.REPLICA_READ_YOUR_WRITES_SECONDS
+
+
+def is_replica_session(db: Session) -> bool:
+    """Whether the session reads from a read replica rather than the primary."""
+    return bool(_replica_binds) and db.get_bind() in _replica_binds
+
+
+def open_read_session(request: Request) -> Session:
+    """A new sync session on a replica (round-robin) when configured, else on the primary. Caller closes it."""
+    if _replica_cycle is None or _read_from_primary(request):
+        return SessionLocal()
+    return SessionLocal(bind=next(_replica_cycle))
+
+
+def get_read_db(request: Request) -> Iterator[Session]:
+    """Session for read-only work: a replica (round-robin) when configured, else the primary."""
+    db = open_read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    if _async_replica_cycle is None or _read_from_primary(request):
+        db = AsyncSessionLocal()
+    else:
+        db = AsyncSessionLocal(bind=next(_async_replica_cycle))
+    async with db:
+        yield db
+
+
+# Session dependencies used by request handlers, chosen by the DB_ASYNC setting
+get_request_db = get_async_db if settings.DB_ASYNC else get_db
+get_request_read_db = get_async_read_db if settings.DB_ASYNC else get_read_db
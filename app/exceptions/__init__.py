@@ -5,7 +5,9 @@ from app.exceptions.movie import (
     DirectorNotFoundError,
     GenreNotFoundError,
 )
-from app.exceptions.rating import InvalidRatingScoreError
+from app.exceptions.rating import InvalidRatingScoreError, InvalidStatsRangeError, RatingBufferFullError
+from app.exceptions.bulk import InvalidBulkPayloadError
+from app.exceptions.pagination import InvalidCursorError, InvalidSortError
 
 __all__ = [
     "BaseAPIException",
@@ -14,6 +16,11 @@ __all__ = [
     "DirectorNotFoundError",
     "GenreNotFoundError",
     "InvalidRatingScoreError",
+    "InvalidStatsRangeError",
+    "InvalidBulkPayloadError",
+    "RatingBufferFullError",
+    "InvalidCursorError",
+    "InvalidSortError",
 ]
 
 
@@ -0,0 +1,6 @@
+from app.exceptions.base import BaseAPIException
+
+
+class InvalidBulkPayloadError(BaseAPIException):
+    def __init__(self, message: str):
+        super().__init__(status_code=422, message=message)
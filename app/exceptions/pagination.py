@@ -0,0 +1,11 @@
+from app.exceptions.base import BaseAPIException
+
+
+class InvalidCursorError(BaseAPIException):
+    def __init__(self):
+        super().__init__(status_code=422, message="Invalid cursor")
+
+
+class InvalidSortError(BaseAPIException):
+    def __init__(self, message: str):
+        super().__init__(status_code=422, message=message)
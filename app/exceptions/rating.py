@@ -6,3 +6,11 @@ class InvalidRatingScoreError(BaseAPIException):
         super().__init__(status_code=422, message=f"Invalid score: {score}. Score must be between 1 and 10")
 
 
+class RatingBufferFullError(BaseAPIException):
+    def __init__(self):
+        super().__init__(status_code=503, message="Rating buffer is full, retry later")
+
+
+class InvalidStatsRangeError(BaseAPIException):
+    def __init__(self, message: str):
+        super().__init__(status_code=422, message=message)
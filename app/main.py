@@ -1,19 +1,61 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import RequestValidationError
 from app.config import settings
 from app.logging_config import setup_logging
 from app.controller.movie import router as movie_router
 from app.controller.rating import router as rating_router
+from app.controller.rating_bulk import router as rating_bulk_router
+from app.controller.system import router as system_router
+from app.controller.metrics import router as metrics_router
 from app.exceptions.base import BaseAPIException
+from app.middleware.metrics import metrics_middleware
+from app.middleware.query_stats import query_stats_middleware
+from app.middleware.read_your_writes import read_your_writes_middleware
+from app.middleware.request_id import request_id_middleware
+from app.services.rating_buffer import rating_buffer
+from app.services.ranking_refresher import ranking_refresher
+from app.services.reference_data import load_reference_data
 from app.utils.response import error_response
 
 # Setup logging configuration
 setup_logging()
 
-app = FastAPI(title=settings.APP_NAME, version="0.1.0", debug=settings.DEBUG)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(load_reference_data)
+    if rating_buffer is not None:
+        rating_buffer.start()
+    if ranking_refresher is not None:
+        ranking_refresher.start()
+    yield
+    if ranking_refresher is not None:
+        await run_in_threadpool(ranking_refresher.stop)
+    if rating_buffer is not None:
+        # Commit queued ratings before the process exits
+        await run_in_threadpool(rating_buffer.stop)
+
+
+app = FastAPI(title=settings.APP_NAME, version="0.1.0", debug=settings.DEBUG, lifespan=lifespan)
+
+if settings.replica_urls and settings.REPLICA_READ_YOUR_WRITES_SECONDS:
+    app.middleware("http")(read_your_writes_middleware)
+if settings.METRICS_ENABLED:
+    # Registered before query stats so it runs inside them and can read the request's DB time
+    app.middleware("http")(metrics_middleware)
+if settings.QUERY_STATS_ENABLED:
+    app.middleware("http")(query_stats_middleware)
+# Outermost, so every log record of the request carries its id
+app.middleware("http")(request_id_middleware)
 
 app.include_router(movie_router, prefix="/api/v1/movies", tags=["movies"])
 app.include_router(rating_router, prefix="/api/v1/movies/{movie_id}/ratings", tags=["ratings"])
+app.include_router(rating_bulk_router, prefix="/api/v1/ratings", tags=["ratings"])
+app.include_router(system_router, prefix="/api/v1/system", tags=["system"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router, tags=["system"])
 
 
 @app.exception_handler(BaseAPIException)
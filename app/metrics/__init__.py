@@ -0,0 +1,35 @@
+from app.metrics.registry import Counter, Gauge, Histogram, CollectedMetric, MetricsRegistry
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter("http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route")
+)
+http_request_db_duration_seconds = registry.histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL statements per HTTP request, in seconds.", ("method", "route")
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request.", ("method", "route"), buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 34)
+)
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+http_exceptions_total = registry.counter(
+    "http_exceptions_total", "Unhandled exceptions raised while handling HTTP requests.", ("route", "exception")
+)
+rating_writes_total = registry.counter("rating_writes_total", "Ratings written or queued, by write path.", ("mode",))
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "CollectedMetric",
+    "MetricsRegistry",
+    "registry",
+    "http_requests_total",
+    "http_request_duration_seconds",
+    "http_request_db_duration_seconds",
+    "http_request_db_queries",
+    "http_requests_in_flight",
+    "http_exceptions_total",
+    "rating_writes_total",
+]
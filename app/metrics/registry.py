@@ -0,0 +1,188 @@
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Optional
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _ThreadShards:
+    """One mutable shard per thread, so writers never contend; readers merge all shards.
+
+    Each shard is only written by its own thread. Readers copy a shard with dict(), which the
+    GIL makes atomic, so no lock is taken on the update path (only once per thread, on first use).
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def snapshots(self) -> list[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        return [dict(shard) for shard in shards]
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    @abstractmethod
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._shards = _ThreadShards()
+
+    def inc(self, amount: float = 1, labels: LabelValues = ()) -> None:
+        shard = self._shards.local()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> dict[LabelValues, float]:
+        totals: dict[LabelValues, float] = {}
+        for shard in self._shards.snapshots():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        return [(self.name, dict(zip(self.labelnames, labels)), value) for labels, value in sorted(self.values().items())]
+
+
+class Gauge(Counter):
+    """A counter that may go down (e.g. requests in flight)."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, labels: LabelValues = ()) -> None:
+        self.inc(-amount, labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._shards = _ThreadShards()
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        shard = self._shards.local()
+        state = shard.get(labels)
+        if state is None:
+            # [per-bucket counts (+Inf last), sum, count]
+            state = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        merged: dict[LabelValues, list] = {}
+        for shard in self._shards.snapshots():
+            for labels, (counts, total, count) in shard.items():
+                state = merged.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0, 0])
+                state[0] = [a + b for a, b in zip(state[0], counts)]
+                state[1] += total
+                state[2] += count
+
+        samples = []
+        for labels, (counts, total, count) in sorted(merged.items()):
+            label_dict = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", {**label_dict, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", label_dict, total))
+            samples.append((f"{self.name}_count", label_dict, count))
+        return samples
+
+
+class CollectedMetric(Metric):
+    """A metric whose samples are read from elsewhere (pool, cache, buffer) at scrape time."""
+
+    def __init__(self, name: str, documentation: str, kind: str, samples: list[tuple[dict[str, str], float]]):
+        super().__init__(name, documentation)
+        self.kind = kind
+        self._samples = samples
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        return [(self.name, labels, value) for labels, value in self._samples]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: list[Metric] = []
+        self._collectors: list[Callable[[], Iterable[CollectedMetric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Optional[Iterable[float]] = None
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS))
+
+    def add_collector(self, collector: Callable[[], Iterable[CollectedMetric]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Serialize every metric in the Prometheus text exposition format (0.0.4)."""
+        metrics = list(self._metrics)
+        for collector in self._collectors:
+            metrics.extend(collector())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
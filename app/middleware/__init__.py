@@ -0,0 +1,6 @@
+from app.middleware.metrics import metrics_middleware
+from app.middleware.query_stats import query_stats_middleware
+from app.middleware.read_your_writes import read_your_writes_middleware
+from app.middleware.request_id import request_id_middleware
+
+__all__ = ["metrics_middleware", "query_stats_middleware", "read_your_writes_middleware", "request_id_middleware"]
@@ -0,0 +1,39 @@
+import time
+from fastapi import Request
+from app.db.query_stats import current_query_stats
+from app.metrics import (
+    http_exceptions_total,
+    http_request_db_duration_seconds,
+    http_request_db_queries,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+)
+
+
+def _route_label(request: Request) -> str:
+    """The matched route template, so /movies/1 and /movies/2 share one series."""
+    route = request.scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+async def metrics_middleware(request: Request, call_next):
+    started = time.perf_counter()
+    http_requests_in_flight.inc()
+    try:
+        response = await call_next(request)
+    except Exception as exc:
+        http_exceptions_total.inc(labels=(_route_label(request), type(exc).__name__))
+        http_requests_total.inc(labels=(request.method, _route_label(request), "500"))
+        raise
+    finally:
+        http_requests_in_flight.dec()
+
+    route = _route_label(request)
+    http_requests_total.inc(labels=(request.method, route, str(response.status_code)))
+    http_request_duration_seconds.observe(time.perf_counter() - started, labels=(request.method, route))
+    stats = current_query_stats()
+    if stats is not None:
+        http_request_db_duration_seconds.observe(stats.duration, labels=(request.method, route))
+        http_request_db_queries.observe(stats.count, labels=(request.method, route))
+    return response
@@ -0,0 +1,36 @@
+import logging
+from fastapi import Request
+from app.config import settings
+from app.db.query_stats import begin_query_stats, end_query_stats
+from app.utils.response import error_response
+
+logger = logging.getLogger(__name__)
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """Count the statements a request runs, report them in Server-Timing and enforce its query budget."""
+    stats, token = begin_query_stats()
+    try:
+        response = await call_next(request)
+    finally:
+        end_query_stats(token)
+
+    fields = {"method": request.method, "path": request.url.path, "db_queries": stats.count, "db_time_ms": round(stats.duration_ms, 2)}
+    if stats.over_budget:
+        logger.warning(
+            "Query budget exceeded (method=%s, path=%s, queries=%s, budget=%s)",
+            request.method,
+            request.url.path,
+            stats.count,
+            stats.budget,
+            extra={**fields, "db_query_budget": stats.budget},
+        )
+        if settings.QUERY_BUDGET_STRICT:
+            response = error_response(message=f"Query budget exceeded: {stats.count} > {stats.budget}", status_code=500)
+    else:
+        logger.debug(
+            "Request queries (method=%s, path=%s, queries=%s, db_time_ms=%.2f)", request.method, request.url.path, stats.count, stats.duration_ms, extra=fields
+        )
+
+    response.headers.append("Server-Timing", f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries"')
+    return response
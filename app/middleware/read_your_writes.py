@@ -0,0 +1,20 @@
+import time
+from fastapi import Request
+from app.config import settings
+from app.db.session import LAST_WRITE_COOKIE
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """Stamp clients that just wrote, so get_read_db sends their next reads to the primary."""
+    response = await call_next(request)
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            f"{time.time():.3f}",
+            max_age=max(int(settings.REPLICA_READ_YOUR_WRITES_SECONDS), 1),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
@@ -0,0 +1,22 @@
+import uuid
+from fastapi import Request
+from app.logging_config import request_id_var
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+def _valid_request_id(value: str) -> bool:
+    return 0 < len(value) <= 128 and value.isascii() and value.isprintable()
+
+
+async def request_id_middleware(request: Request, call_next):
+    """Tag the request (and every log record it emits) with the caller's X-Request-ID or a new one."""
+    incoming = request.headers.get(REQUEST_ID_HEADER, "")
+    request_id = incoming if _valid_request_id(incoming) else uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
@@ -2,6 +2,8 @@ from app.models.director import Director
 from app.models.genre import Genre
 from app.models.movie import Movie, movie_genres
 from app.models.movie_rating import MovieRating
+from app.models.movie_rating_stats import MovieRatingStats
+from app.models.movie_rating_daily import MovieRatingDaily
+from app.models.movie_ranking import MovieRanking
 
-__all__ = ["Director", "Genre", "Movie", "movie_genres", "MovieRating"]
-
+__all__ = ["Director", "Genre", "Movie", "movie_genres", "MovieRating", "MovieRatingStats", "MovieRatingDaily", "MovieRanking"]
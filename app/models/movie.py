@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Index, DateTime
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.db.base import Base
 
 movie_genres = Table(
@@ -7,6 +8,7 @@ movie_genres = Table(
     Base.metadata,
     Column("movie_id", Integer, ForeignKey("movies.id"), primary_key=True),
     Column("genre_id", Integer, ForeignKey("genres.id"), primary_key=True),
+    Index("ix_movie_genres_genre_id", "genre_id"),
 )
 
 
@@ -15,11 +17,20 @@ class Movie(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    director_id = Column(Integer, ForeignKey("directors.id"), nullable=False)
+    director_id = Column(Integer, ForeignKey("directors.id"), nullable=False, index=True)
     release_year = Column(Integer, nullable=False)
     cast = Column(String, nullable=True)
     description = Column(String, nullable=True)
+    # Bumped on every change to the movie or its genres; used for HTTP validators
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     director = relationship("Director", back_populates="movies")
     genres = relationship("Genre", secondary=movie_genres, back_populates="movies")
     ratings = relationship("MovieRating", back_populates="movie", cascade="all, delete-orphan")
+    rating_stats = relationship("MovieRatingStats", back_populates="movie", uselist=False, cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_movies_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_movies_release_year_id", "release_year", "id"),
+    )
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class MovieRanking(Base):
+    """Precomputed leaderboard keys per rated movie, refreshed incrementally by the ranking refresher."""
+
+    __tablename__ = "movie_rankings"
+
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    average_rating = Column(Float, nullable=False)
+    ratings_count = Column(Integer, nullable=False)
+    # Bayesian average: (v * R + m * C) / (v + m), with m = RANKING_MIN_VOTES and C the global mean
+    weighted_rating = Column(Float, nullable=False)
+    # Ratings received in the last RANKING_TRENDING_DAYS days
+    trending_count = Column(Integer, nullable=False, default=0, server_default="0")
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_movie_rankings_average_rating_movie_id", "average_rating", "movie_id"),
+        Index("ix_movie_rankings_ratings_count_movie_id", "ratings_count", "movie_id"),
+        Index("ix_movie_rankings_weighted_rating_movie_id", "weighted_rating", "movie_id"),
+        Index("ix_movie_rankings_trending_count_movie_id", "trending_count", "movie_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, CheckConstraint
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -14,4 +14,9 @@ class MovieRating(Base):
 
     movie = relationship("Movie", back_populates="ratings")
 
-    __table_args__ = (CheckConstraint("score >= 1 AND score <= 10", name="check_score_range"),)
+    __table_args__ = (
+        CheckConstraint("score >= 1 AND score <= 10", name="check_score_range"),
+        Index("ix_movie_ratings_movie_id_score", "movie_id", "score"),
+        # Keyset pagination of a movie's ratings; score is included so pages are index-only scans
+        Index("ix_movie_ratings_movie_id_rated_at_id", "movie_id", "rated_at", "id", postgresql_include=["score"]),
+    )
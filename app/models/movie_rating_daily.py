@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, BigInteger, Date, ForeignKey, Index
+from app.db.base import Base
+
+
+class MovieRatingDaily(Base):
+    """Per-movie, per-day (UTC) rating aggregates maintained alongside every rating insert."""
+
+    __tablename__ = "movie_rating_daily"
+
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    ratings_sum = Column(BigInteger, nullable=False, default=0, server_default="0")
+    ratings_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_5 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_6 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_7 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_8 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_9 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_10 = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (Index("ix_movie_rating_daily_day", "day"),)
@@ -0,0 +1,39 @@
+from typing import Optional
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+
+SCORE_VALUES = range(1, 11)
+
+
+class MovieRatingStats(Base):
+    """Per-movie rating aggregates maintained alongside every rating insert."""
+
+    __tablename__ = "movie_rating_stats"
+
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    ratings_sum = Column(BigInteger, nullable=False, default=0, server_default="0")
+    ratings_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_5 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_6 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_7 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_8 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_9 = Column(Integer, nullable=False, default=0, server_default="0")
+    score_10 = Column(Integer, nullable=False, default=0, server_default="0")
+    last_rated_at = Column(DateTime(timezone=True), nullable=True)
+
+    movie = relationship("Movie", back_populates="rating_stats")
+
+    @property
+    def average_rating(self) -> Optional[float]:
+        if not self.ratings_count:
+            return None
+        return self.ratings_sum / self.ratings_count
+
+    @property
+    def histogram(self) -> dict[int, int]:
+        return {score: getattr(self, f"score_{score}") for score in SCORE_VALUES}
@@ -2,6 +2,7 @@ from app.repositories.director import DirectorRepository
 from app.repositories.genre import GenreRepository
 from app.repositories.movie import MovieRepository
 from app.repositories.movie_rating import MovieRatingRepository
+from app.repositories.movie_rating_stats import MovieRatingStatsRepository
+from app.repositories.movie_ranking import MovieRankingRepository
 
-__all__ = ["DirectorRepository", "GenreRepository", "MovieRepository", "MovieRatingRepository"]
-
+__all__ = ["DirectorRepository", "GenreRepository", "MovieRepository", "MovieRatingRepository", "MovieRatingStatsRepository", "MovieRankingRepository"]
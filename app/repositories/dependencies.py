@@ -3,6 +3,7 @@ from app.repositories.director import DirectorRepository
 from app.repositories.genre import GenreRepository
 from app.repositories.movie import MovieRepository
 from app.repositories.movie_rating import MovieRatingRepository
+from app.repositories.movie_rating_stats import MovieRatingStatsRepository
 
 
 def get_director_repository(db: Session) -> DirectorRepository:
@@ -20,3 +21,6 @@ def get_movie_repository(db: Session) -> MovieRepository:
 def get_rating_repository(db: Session) -> MovieRatingRepository:
     return MovieRatingRepository(db)
 
+
+def get_rating_stats_repository(db: Session) -> MovieRatingStatsRepository:
+    return MovieRatingStatsRepository(db)
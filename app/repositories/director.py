@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.director import Director
 
@@ -10,5 +11,10 @@ class DirectorRepository:
     def get_by_id(self, director_id: int) -> Optional[Director]:
         return self.db.query(Director).filter(Director.id == director_id).first()
 
-    def get_all(self) -> list[Director]:
-        return self.db.query(Director).all()
+    def get_existing_ids(self, director_ids: set[int]) -> set[int]:
+        if not director_ids:
+            return set()
+        return set(self.db.execute(select(Director.id).where(Director.id.in_(director_ids))).scalars())
+
+    def get_all(self, limit: Optional[int] = None) -> list[Director]:
+        return self.db.query(Director).order_by(Director.id).limit(limit).all()
@@ -1,9 +1,39 @@
-from typing import Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from app.models.movie import Movie
+import json
+from datetime import datetime
+from typing import Any, Iterator, Optional
+from sqlalchemy import Float, Row, cast, delete, exists, func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.db.explain import Explain
+from app.models.director import Director
+from app.models.movie import Movie, movie_genres
 from app.models.genre import Genre
 from app.models.movie_rating import MovieRating
+from app.models.movie_rating_stats import MovieRatingStats
+from app.models.movie_ranking import MovieRanking
+
+SORT_COLUMNS = {
+    "id": Movie.id,
+    "title": Movie.title,
+    "release_year": Movie.release_year,
+}
+# Leaderboard sorts, read from the precomputed movie_rankings (best first; only rated movies are listed)
+RANKING_SORT_COLUMNS = {
+    "average_rating": MovieRanking.average_rating,
+    "ratings_count": MovieRanking.ratings_count,
+    "weighted": MovieRanking.weighted_rating,
+    "trending": MovieRanking.trending_count,
+}
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _stats_tuple(stats: Optional[MovieRatingStats]) -> tuple[Optional[float], int]:
+    if stats is None:
+        return None, 0
+    return stats.average_rating, stats.ratings_count
 
 
 class MovieRepository:
@@ -20,78 +50,214 @@ class MovieRepository:
 
     def create(
         self, title: str, director_id: int, release_year: int, cast: Optional[str] = None, description: Optional[str] = None, genre_ids: Optional[list[int]] = None
-    ) -> Movie:
-        movie = Movie(title=title, director_id=director_id, release_year=release_year, cast=cast, description=description)
-        if genre_ids:
-            genres = self.db.query(Genre).filter(Genre.id.in_(genre_ids)).all()
-            movie.genres = genres
-        self.db.add(movie)
-        self.db.commit()
-        self.db.refresh(movie)
-        return movie
+    ) -> int:
+        """Insert a movie and its genre links (ids are not checked here); commits. Returns the new id."""
+        movie = {"title": title, "director_id": director_id, "release_year": release_year, "cast": cast, "description": description}
+        return self.bulk_create([movie], [genre_ids or []])[0]
 
-    def update(self, movie: Movie, **kwargs) -> Movie:
-        for key, value in kwargs.items():
-            if value is not None:
-                setattr(movie, key, value)
-        self.db.commit()
-        self.db.refresh(movie)
-        return movie
+    def bulk_create(self, movies: list[dict[str, Any]], genre_ids: list[list[int]]) -> list[int]:
+        """Insert movies with one multi-row INSERT ... RETURNING and their genre links with another; commits.
 
-    def update_genres(self, movie: Movie, genre_ids: list[int]) -> Movie:
-        genres = self.db.query(Genre).filter(Genre.id.in_(genre_ids)).all()
-        movie.genres = genres
+        genre_ids[i] holds the genres of movies[i]. Returns the new ids in input order.
+        """
+        if not movies:
+            return []
+        movie_ids = list(
+            self.db.execute(insert(Movie).returning(Movie.id, sort_by_parameter_order=True), movies).scalars()
+        )
+        links = [
+            {"movie_id": movie_id, "genre_id": genre_id}
+            for movie_id, movie_genre_ids in zip(movie_ids, genre_ids)
+            for genre_id in dict.fromkeys(movie_genre_ids)
+        ]
+        if links:
+            self.db.execute(insert(movie_genres), links)
         self.db.commit()
-        self.db.refresh(movie)
-        return movie
+        return movie_ids
 
-    def delete(self, movie: Movie) -> None:
-        self.db.delete(movie)
-        self.db.commit()
+    def update_returning(self, movie_id: int, **values: Any) -> Optional[Row]:
+        """Update a movie and return it with its director and rating stats in one statement. Does not commit.
 
-    def get_list(
-        self,
-        page: int = 1,
-        page_size: int = 10,
-        title: Optional[str] = None,
-        release_year: Optional[int] = None,
-        genre_name: Optional[str] = None,
-    ) -> tuple[list[Movie], int]:
-        query = self.db.query(Movie).options(joinedload(Movie.director), joinedload(Movie.genres))
+        The version is always bumped. Returns None when the movie does not exist.
+        """
+        updated = (
+            update(Movie)
+            .where(Movie.id == movie_id)
+            .values(**values, version=Movie.version + 1)
+            .returning(Movie.id, Movie.title, Movie.release_year, Movie.cast, Movie.description, Movie.director_id)
+            .cte("updated_movie")
+        )
+        statement = (
+            select(
+                updated,
+                Director.name.label("director_name"),
+                Director.birth_year.label("director_birth_year"),
+                Director.description.label("director_description"),
+                MovieRatingStats.ratings_sum,
+                MovieRatingStats.ratings_count,
+            )
+            .join(Director, Director.id == updated.c.director_id)
+            .outerjoin(MovieRatingStats, MovieRatingStats.movie_id == updated.c.id)
+        )
+        return self.db.execute(statement).first()
+
+    def replace_genres(self, movie_id: int, genre_ids: list[int]) -> None:
+        """Make the movie's genres exactly genre_ids, touching only the rows that differ. Does not commit."""
+        removed = delete(movie_genres).where(movie_genres.c.movie_id == movie_id)
+        if genre_ids:
+            removed = removed.where(movie_genres.c.genre_id.not_in(genre_ids))
+        self.db.execute(removed)
+        if genre_ids:
+            added = (
+                insert(movie_genres)
+                .values([{"movie_id": movie_id, "genre_id": genre_id} for genre_id in dict.fromkeys(genre_ids)])
+                .on_conflict_do_nothing()
+            )
+            self.db.execute(added)
+
+    def get_genre_names(self, movie_id: int) -> list[str]:
+        statement = (
+            select(Genre.name)
+            .join(movie_genres, movie_genres.c.genre_id == Genre.id)
+            .where(movie_genres.c.movie_id == movie_id)
+        )
+        return list(self.db.execute(statement).scalars())
+
+    def exists(self, movie_id: int) -> bool:
+        return self.db.execute(select(exists().where(Movie.id == movie_id))).scalar()
 
+    def get_existing_ids(self, movie_ids: set[int]) -> set[int]:
+        """Return the subset of movie_ids that exist, with a single query."""
+        if not movie_ids:
+            return set()
+        return set(self.db.execute(select(Movie.id).where(Movie.id.in_(movie_ids))).scalars())
+
+    def get_validators(self, movie_id: int) -> Optional[tuple[int, datetime, int, Optional[datetime]]]:
+        """Return (version, updated_at, ratings_count, last_rated_at) with a single primary-key lookup."""
+        row = (
+            self.db.query(Movie.version, Movie.updated_at, MovieRatingStats.ratings_count, MovieRatingStats.last_rated_at)
+            .outerjoin(MovieRatingStats, MovieRatingStats.movie_id == Movie.id)
+            .filter(Movie.id == movie_id)
+            .first()
+        )
+        if row is None:
+            return None
+        return row.version, row.updated_at, row.ratings_count or 0, row.last_rated_at
+
+    def delete_by_id(self, movie_id: int) -> bool:
+        """Delete the movie with its ratings and genre links using bulk DELETEs, in one transaction.
+
+        Its aggregate, daily rollup and ranking rows go through their ON DELETE CASCADE foreign keys.
+        Returns False when there is no such movie.
+        """
+        try:
+            self.db.execute(delete(MovieRating).where(MovieRating.movie_id == movie_id))
+            self.db.execute(delete(movie_genres).where(movie_genres.c.movie_id == movie_id))
+            deleted = self.db.execute(delete(Movie).where(Movie.id == movie_id).returning(Movie.id)).first()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return deleted is not None
+
+    def _apply_filters(self, query, title: Optional[str], release_year: Optional[int], genre_id: Optional[int]):
         if title:
-            query = query.filter(Movie.title.ilike(f"%{title}%"))
+            # Served by the pg_trgm GIN index on movies.title
+            query = query.filter(Movie.title.ilike(f"%{_escape_like(title)}%", escape="\\"))
         if release_year:
             query = query.filter(Movie.release_year == release_year)
-        if genre_name:
-            query = query.join(Movie.genres).filter(Genre.name == genre_name)
+        if genre_id is not None:
+            # Genre names are resolved to ids by the caller, so the link table is probed without joining genres
+            query = query.filter(exists().where(movie_genres.c.movie_id == Movie.id, movie_genres.c.genre_id == genre_id))
+        return query
+
+    def _sort_expression(self, sort: str, title: Optional[str] = None) -> tuple[Any, bool]:
+        """Return the sort key expression and whether it sorts descending."""
+        if sort == "relevance":
+            # similarity() is float4, which does not survive the JSON cursor exactly; double precision does
+            return cast(func.similarity(Movie.title, title), Float), True
+        if sort in RANKING_SORT_COLUMNS:
+            return RANKING_SORT_COLUMNS[sort], True
+        return SORT_COLUMNS[sort], False
+
+    def _apply_ordering(self, query, sort_key, descending: bool = False, after: Optional[tuple[Any, int]] = None, backward: bool = False):
+        """Order by (sort_key, id) and, when a keyset position is given, continue strictly after/before it."""
+        keys = [Movie.id] if sort_key is Movie.id else [sort_key, Movie.id]
+        reverse = descending != backward
 
-        total_items = query.count()
-        offset = (page - 1) * page_size
-        movies = query.offset(offset).limit(page_size).all()
+        if after is not None:
+            if len(keys) == 1:
+                position, values = Movie.id, after[1]
+            else:
+                position, values = tuple_(*keys), tuple_(*after)
+            query = query.filter(position < values if reverse else position > values)
 
-        return movies, total_items
+        return query.order_by(*[key.desc() if reverse else key.asc() for key in keys])
 
     def get_movie_with_stats(self, movie_id: int) -> Optional[tuple[Movie, Optional[float], int]]:
         movie = (
             self.db.query(Movie)
-            .options(joinedload(Movie.director), joinedload(Movie.genres))
+            .options(joinedload(Movie.director), joinedload(Movie.genres), joinedload(Movie.rating_stats))
             .filter(Movie.id == movie_id)
             .first()
         )
         if not movie:
             return None
 
-        rating_stats = (
-            self.db.query(func.avg(MovieRating.score).label("avg_rating"), func.count(MovieRating.id).label("count"))
-            .filter(MovieRating.movie_id == movie_id)
-            .first()
+        avg_rating, ratings_count = _stats_tuple(movie.rating_stats)
+        return movie, avg_rating, ratings_count
+
+    def iter_export_rows(self, batch_size: int = 1000) -> Iterator[Row]:
+        """Stream every movie with its genre ids and rating stats, ordered by id, through a server-side cursor."""
+        genre_ids = (
+            select(func.array_agg(aggregate_order_by(movie_genres.c.genre_id, movie_genres.c.genre_id)))
+            .where(movie_genres.c.movie_id == Movie.id)
+            .scalar_subquery()
         )
+        statement = (
+            select(
+                Movie.id,
+                Movie.title,
+                Movie.director_id,
+                Movie.release_year,
+                Movie.cast,
+                Movie.description,
+                genre_ids.label("genres"),
+                MovieRatingStats.ratings_sum,
+                MovieRatingStats.ratings_count,
+            )
+            .outerjoin(MovieRatingStats, MovieRatingStats.movie_id == Movie.id)
+            .order_by(Movie.id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.db.execute(statement)
 
-        avg_rating = float(rating_stats.avg_rating) if rating_stats.avg_rating else None
-        ratings_count = rating_stats.count or 0
+    def get_by_ids_with_stats(self, movie_ids: list[int]) -> list[Movie]:
+        """Load movies with director, genres and rating stats, preserving the order of movie_ids."""
+        if not movie_ids:
+            return []
+        movies = (
+            self.db.query(Movie)
+            .options(joinedload(Movie.director), selectinload(Movie.genres), joinedload(Movie.rating_stats))
+            .filter(Movie.id.in_(movie_ids))
+            .all()
+        )
+        movies_by_id = {movie.id: movie for movie in movies}
+        return [movies_by_id[movie_id] for movie_id in movie_ids if movie_id in movies_by_id]
 
-        return movie, avg_rating, ratings_count
+    def estimate_count(self, query) -> int:
+        """Approximate row count of a filtered query from planner statistics, without scanning."""
+        statement = query.with_entities(Movie.id).order_by(None).statement
+        froms = statement.get_final_froms()
+        if statement.whereclause is None and len(froms) == 1 and froms[0] is Movie.__table__:
+            reltuples = self.db.execute(text("SELECT reltuples FROM pg_class WHERE oid = 'movies'::regclass")).scalar()
+            if reltuples is not None and reltuples >= 0:
+                return int(reltuples)
+
+        plan = self.db.execute(Explain(statement)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     def get_list_with_stats(
         self,
@@ -99,35 +265,59 @@ class MovieRepository:
         page_size: int = 10,
         title: Optional[str] = None,
         release_year: Optional[int] = None,
-        genre_name: Optional[str] = None,
-    ) -> tuple[list[tuple[Movie, Optional[float], int]], int]:
-        query = self.db.query(Movie).options(joinedload(Movie.director), joinedload(Movie.genres))
+        genre_id: Optional[int] = None,
+        sort: str = "id",
+        after: Optional[tuple[Any, int]] = None,
+        backward: bool = False,
+        count: str = "exact",
+    ) -> tuple[list[tuple[Movie, Optional[float], int]], Optional[int], bool, list[Any]]:
+        """Return a page of movies with their rating stats, the total count, whether more rows follow
+        and each row's sort key value (for building cursors).
 
-        if title:
-            query = query.filter(Movie.title.ilike(f"%{title}%"))
-        if release_year:
-            query = query.filter(Movie.release_year == release_year)
-        if genre_name:
-            query = query.join(Movie.genres).filter(Genre.name == genre_name)
-
-        total_items = query.count()
-        offset = (page - 1) * page_size
-        movies = query.offset(offset).limit(page_size).all()
-
-        movie_ids = [movie.id for movie in movies]
-        rating_stats = (
-            self.db.query(
-                MovieRating.movie_id,
-                func.avg(MovieRating.score).label("avg_rating"),
-                func.count(MovieRating.id).label("count"),
-            )
-            .filter(MovieRating.movie_id.in_(movie_ids))
-            .group_by(MovieRating.movie_id)
-            .all()
-        )
+        With `after` set, the page is read by keyset from that (sort_key, id) position instead of by offset;
+        `backward` walks towards the start of the list. Rows are always returned in forward order.
+
+        `count` selects how total_items is obtained: "exact" (a window function over the page query, so
+        offset pages need a single round-trip), "estimate" (planner statistics) or "none" (not computed).
+
+        The page is resolved in two phases: first only the ordered page of movie ids is selected (no joins
+        against collections, so LIMIT applies to movies directly), then those movies are hydrated with
+        their director, genres and rating stats in batched IN queries.
+        """
+        sort_key, descending = self._sort_expression(sort, title)
+        query = self.db.query(Movie.id)
+        if sort in RANKING_SORT_COLUMNS:
+            query = query.join(MovieRanking, MovieRanking.movie_id == Movie.id)
+        query = self._apply_filters(query, title, release_year, genre_id)
+        keyed_query = query.add_columns(sort_key)
+
+        total_items = None
+        if after is None and count == "exact":
+            offset = (page - 1) * page_size
+            page_query = self._apply_ordering(keyed_query, sort_key, descending).add_columns(func.count().over())
+            rows = page_query.offset(offset).limit(page_size).all()
+            # An offset past the end returns no rows, and with them no window total
+            total_items = rows[0][2] if rows else (query.count() if offset else 0)
+            has_more = offset + len(rows) < total_items
+        else:
+            if after is None:
+                page_query = self._apply_ordering(keyed_query, sort_key, descending).offset((page - 1) * page_size)
+            else:
+                page_query = self._apply_ordering(keyed_query, sort_key, descending, after, backward)
+            rows = page_query.limit(page_size + 1).all()
+            has_more = len(rows) > page_size
+            rows = rows[:page_size]
+            if backward:
+                rows.reverse()
 
-        stats_dict = {stat.movie_id: (float(stat.avg_rating) if stat.avg_rating else None, stat.count or 0) for stat in rating_stats}
+            if count == "exact":
+                total_items = query.count()
+            elif count == "estimate":
+                total_items = self.estimate_count(query)
 
-        movies_with_stats = [(movie, stats_dict.get(movie.id, (None, 0))[0], stats_dict.get(movie.id, (None, 0))[1]) for movie in movies]
+        movie_ids = [row[0] for row in rows]
+        sort_keys = [row[1] for row in rows]
+        movies = self.get_by_ids_with_stats(movie_ids)
+        movies_with_stats = [(movie, *_stats_tuple(movie.rating_stats)) for movie in movies]
 
-        return movies_with_stats, total_items
+        return movies_with_stats, total_items, has_more, sort_keys
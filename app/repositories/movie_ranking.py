@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Float, cast, delete, exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.movie_ranking import MovieRanking
+from app.models.movie_rating_daily import MovieRatingDaily
+from app.models.movie_rating_stats import MovieRatingStats
+from app.repositories.movie_rating_stats import utc_day
+
+# Transaction-level advisory lock taken by a refresh, so concurrent workers do not refresh at once
+REFRESH_LOCK_KEY = 7_267_001
+
+
+class MovieRankingRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def try_lock(self) -> bool:
+        """Take the refresh lock for the current transaction; False if another refresh holds it."""
+        return self.db.execute(select(func.pg_try_advisory_xact_lock(REFRESH_LOCK_KEY))).scalar()
+
+    def now(self) -> datetime:
+        return self.db.execute(select(func.now())).scalar()
+
+    def global_mean(self) -> Optional[float]:
+        """Mean score over every rating, from the per-movie aggregates."""
+        total_sum, total_count = self.db.execute(
+            select(func.sum(MovieRatingStats.ratings_sum), func.sum(MovieRatingStats.ratings_count))
+        ).one()
+        if not total_count:
+            return None
+        return float(total_sum) / total_count
+
+    def upsert_from_stats(self, mean: float, min_votes: int, since: Optional[datetime] = None) -> int:
+        """Recompute rating keys for movies rated at or after `since` (all rated movies when None). Does not commit."""
+        ratings_sum = cast(MovieRatingStats.ratings_sum, Float)
+        rows = select(
+            MovieRatingStats.movie_id,
+            (ratings_sum / MovieRatingStats.ratings_count).label("average_rating"),
+            MovieRatingStats.ratings_count,
+            ((ratings_sum + min_votes * mean) / (MovieRatingStats.ratings_count + min_votes)).label("weighted_rating"),
+            func.now(),
+        ).where(MovieRatingStats.ratings_count > 0)
+        if since is not None:
+            rows = rows.where(MovieRatingStats.last_rated_at >= since)
+
+        stmt = insert(MovieRanking).from_select(
+            ["movie_id", "average_rating", "ratings_count", "weighted_rating", "refreshed_at"], rows, include_defaults=False
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MovieRanking.movie_id],
+            set_={
+                "average_rating": stmt.excluded.average_rating,
+                "ratings_count": stmt.excluded.ratings_count,
+                "weighted_rating": stmt.excluded.weighted_rating,
+                "refreshed_at": stmt.excluded.refreshed_at,
+            },
+            # Movies re-read because of the refresh overlap are only rewritten if they changed
+            where=(MovieRanking.ratings_count != stmt.excluded.ratings_count)
+            | (MovieRanking.weighted_rating != stmt.excluded.weighted_rating),
+        )
+        return self.db.execute(stmt).rowcount
+
+    def delete_unrated(self) -> int:
+        """Drop rankings of movies that no longer have ratings (e.g. after an aggregate rebuild). Does not commit."""
+        rated = exists().where(MovieRatingStats.movie_id == MovieRanking.movie_id, MovieRatingStats.ratings_count > 0)
+        return self.db.execute(delete(MovieRanking).where(~rated)).rowcount
+
+    def update_trending(self, days: int) -> int:
+        """Set trending_count to the ratings of the last `days` UTC days, touching only rows that change. Does not commit."""
+        window = MovieRatingDaily.day > utc_day(func.now()) - days
+        recent = (
+            select(MovieRatingDaily.movie_id, func.sum(MovieRatingDaily.ratings_count).label("trending_count"))
+            .where(window)
+            .group_by(MovieRatingDaily.movie_id)
+            .subquery()
+        )
+        changed = self.db.execute(
+            update(MovieRanking)
+            .where(MovieRanking.movie_id == recent.c.movie_id, MovieRanking.trending_count != recent.c.trending_count)
+            .values(trending_count=recent.c.trending_count)
+        ).rowcount
+        in_window = exists().where(MovieRatingDaily.movie_id == MovieRanking.movie_id, window)
+        expired = self.db.execute(
+            update(MovieRanking).where(MovieRanking.trending_count > 0, ~in_window).values(trending_count=0)
+        ).rowcount
+        return changed + expired
@@ -1,22 +1,68 @@
-from typing import Optional
+import io
+from datetime import datetime
+from typing import Iterator, Optional
+from sqlalchemy import Row, Select, insert, select, text, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models.movie_rating import MovieRating
+from app.repositories.movie_rating_stats import MovieRatingStatsRepository, rating_deltas
 
 
 class MovieRatingRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.stats_repo = MovieRatingStatsRepository(db)
 
     def create(self, movie_id: int, score: int) -> MovieRating:
         rating = MovieRating(movie_id=movie_id, score=score)
         self.db.add(rating)
+        self.stats_repo.increment(movie_id, score)
         self.db.commit()
         self.db.refresh(rating)
         return rating
 
+    def bulk_create(self, ratings: list[tuple[int, int]], synchronous_commit: bool = True) -> None:
+        """Insert many (movie_id, score) ratings and fold them into the aggregates in one transaction.
+
+        Uses COPY when the connection is psycopg2, and a batched executemany INSERT otherwise.
+        With synchronous_commit=False the commit does not wait for the WAL flush.
+        """
+        if not ratings:
+            return
+        connection = self.db.connection()
+        if not synchronous_commit:
+            connection.execute(text("SET LOCAL synchronous_commit = off"))
+        if connection.dialect.driver == "psycopg2":
+            buffer = io.StringIO("".join(f"{movie_id}\t{score}\n" for movie_id, score in ratings))
+            with connection.connection.cursor() as cursor:
+                try:
+                    cursor.copy_expert("COPY movie_ratings (movie_id, score) FROM STDIN", buffer)
+                except connection.dialect.dbapi.IntegrityError as e:
+                    # Raw COPY bypasses SQLAlchemy's exception wrapping; surface it like an INSERT would
+                    raise IntegrityError("COPY movie_ratings (movie_id, score) FROM STDIN", None, e) from e
+        else:
+            self.db.execute(insert(MovieRating), [{"movie_id": movie_id, "score": score} for movie_id, score in ratings])
+        self.stats_repo.apply_deltas(rating_deltas(ratings))
+        self.db.commit()
+
     def get_by_id(self, rating_id: int) -> Optional[MovieRating]:
         return self.db.query(MovieRating).filter(MovieRating.id == rating_id).first()
 
-    def get_by_movie_id(self, movie_id: int) -> list[MovieRating]:
-        return self.db.query(MovieRating).filter(MovieRating.movie_id == movie_id).all()
+    def _by_movie_query(self, movie_id: int, descending: bool, after: Optional[tuple[datetime, int]]) -> Select:
+        """(id, score, rated_at) of a movie's ratings ordered by (rated_at, id), strictly after a keyset position if given."""
+        statement = select(MovieRating.id, MovieRating.score, MovieRating.rated_at).where(MovieRating.movie_id == movie_id)
+        if after is not None:
+            position = tuple_(MovieRating.rated_at, MovieRating.id)
+            statement = statement.where(position < tuple_(*after) if descending else position > tuple_(*after))
+        keys = [MovieRating.rated_at, MovieRating.id]
+        return statement.order_by(*[key.desc() if descending else key.asc() for key in keys])
+
+    def get_page(self, movie_id: int, limit: int, descending: bool = True, after: Optional[tuple[datetime, int]] = None) -> list[Row]:
+        """A page of a movie's ratings as lightweight rows, read by keyset from the (movie_id, rated_at, id) index."""
+        return self.db.execute(self._by_movie_query(movie_id, descending, after).limit(limit)).all()
 
+    def iter_by_movie_id(
+        self, movie_id: int, descending: bool = True, after: Optional[tuple[datetime, int]] = None, batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """Stream all of a movie's ratings through a server-side cursor, `batch_size` rows per fetch."""
+        yield from self.db.execute(self._by_movie_query(movie_id, descending, after).execution_options(yield_per=batch_size))
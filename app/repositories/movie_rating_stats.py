@@ -0,0 +1,186 @@
+from collections import Counter
+from datetime import date, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import BigInteger, Date, DateTime, Integer, Row, bindparam, cast, func, select, delete, or_
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+from app.models.movie_rating import MovieRating
+from app.models.movie_rating_daily import MovieRatingDaily
+from app.models.movie_rating_stats import MovieRatingStats, SCORE_VALUES
+
+COUNTER_COLUMNS = ["ratings_sum", "ratings_count"] + [f"score_{score}" for score in SCORE_VALUES]
+# Bucket widths accepted by get_buckets, as date_trunc units
+BUCKET_STEPS = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+# Dates get_buckets accepts: asyncpg sends date.min and date.max as -infinity and infinity,
+# which would make the bucket series endless
+MIN_BUCKET_DATE = date.min + timedelta(days=1)
+MAX_BUCKET_DATE = date.max - timedelta(days=1)
+
+
+def utc_day(timestamp):
+    """SQL expression for the UTC calendar day of a timestamptz expression."""
+    return cast(func.timezone("UTC", timestamp), Date)
+
+
+def _truncate(unit: str, day):
+    """SQL expression for the first day of the day/week bucket containing `day` (weeks start on Monday)."""
+    return cast(func.date_trunc(unit, cast(day, DateTime)), Date)
+
+
+def rating_delta(score: int) -> dict[str, int]:
+    """Counter increments contributed by a single rating."""
+    delta = {column: 0 for column in COUNTER_COLUMNS}
+    delta["ratings_sum"] = score
+    delta["ratings_count"] = 1
+    delta[f"score_{score}"] = 1
+    return delta
+
+
+def rating_deltas(ratings: Iterable[tuple[int, int]]) -> dict[int, dict[str, int]]:
+    """Counter increments per movie for a batch of (movie_id, score) ratings."""
+    deltas: dict[int, dict[str, int]] = {}
+    for (movie_id, score), count in Counter(ratings).items():
+        delta = deltas.setdefault(movie_id, dict.fromkeys(COUNTER_COLUMNS, 0))
+        delta["ratings_sum"] += score * count
+        delta["ratings_count"] += count
+        delta[f"score_{score}"] += count
+    return deltas
+
+
+class MovieRatingStatsRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_movie_id(self, movie_id: int) -> Optional[MovieRatingStats]:
+        return self.db.get(MovieRatingStats, movie_id)
+
+    def increment(self, movie_id: int, score: int) -> None:
+        """Add one rating to the movie's aggregates. Does not commit."""
+        self.apply_deltas({movie_id: rating_delta(score)})
+
+    def apply_deltas(self, deltas: dict[int, dict[str, int]]) -> None:
+        """Atomically add counter deltas per movie to its totals and to today's daily rollup. Does not commit.
+
+        Both upserts run as one statement, reading the deltas from arrays (one bind parameter per column,
+        whatever the batch size).
+        """
+        if not deltas:
+            return
+        # Rows are sorted by movie_id so concurrent upserts lock rows in the same order
+        movie_ids = sorted(deltas)
+        columns = ["movie_id"] + COUNTER_COLUMNS
+        arrays = [bindparam("movie_id", movie_ids, type_=ARRAY(Integer))] + [
+            bindparam(column, [deltas[movie_id][column] for movie_id in movie_ids], type_=ARRAY(BigInteger if column == "ratings_sum" else Integer))
+            for column in COUNTER_COLUMNS
+        ]
+        rows = select(func.unnest(*arrays).table_valued(*columns).render_derived()).cte("deltas")
+
+        stats = insert(MovieRatingStats).from_select(
+            columns + ["last_rated_at"], select(*[rows.c[column] for column in columns], func.now()), include_defaults=False
+        )
+        stats = stats.on_conflict_do_update(
+            index_elements=[MovieRatingStats.movie_id],
+            set_={
+                **{column: getattr(MovieRatingStats, column) + getattr(stats.excluded, column) for column in COUNTER_COLUMNS},
+                "last_rated_at": stats.excluded.last_rated_at,
+            },
+        )
+        daily = insert(MovieRatingDaily).from_select(
+            columns + ["day"], select(*[rows.c[column] for column in columns], utc_day(func.now())), include_defaults=False
+        )
+        daily = daily.on_conflict_do_update(
+            index_elements=[MovieRatingDaily.movie_id, MovieRatingDaily.day],
+            set_={column: getattr(MovieRatingDaily, column) + getattr(daily.excluded, column) for column in COUNTER_COLUMNS},
+        )
+        self.db.execute(daily.add_cte(stats.cte("stats_upsert")))
+
+    def get_buckets(self, movie_id: int, unit: str, start: date, end: date, window: int) -> list[Row]:
+        """Per-bucket counters of a movie between start and end (inclusive), read from movie_rating_daily.
+
+        Every bucket of the range is returned, empty ones with zero counters. Each row also carries
+        rolling_sum and rolling_count over the bucket and the `window - 1` buckets before it, summed
+        with a window function (buckets before `start` are read for that but not returned).
+        """
+        step = BUCKET_STEPS[unit]
+        # The warm-up buckets are clamped to MIN_BUCKET_DATE, so ranges starting in year 1 do not overflow
+        first = _truncate(unit, start - min(step * (window - 1), start - MIN_BUCKET_DATE))
+        last = _truncate(unit, end)
+        buckets = select(cast(func.generate_series(cast(first, DateTime), cast(last, DateTime), step), Date).label("bucket")).subquery("buckets")
+
+        bucket = _truncate(unit, MovieRatingDaily.day)
+        rolled = (
+            select(bucket.label("bucket"), *[cast(func.sum(getattr(MovieRatingDaily, column)), BigInteger).label(column) for column in COUNTER_COLUMNS])
+            .where(MovieRatingDaily.movie_id == movie_id, MovieRatingDaily.day >= first, MovieRatingDaily.day <= end)
+            .group_by(bucket)
+            .subquery("rolled")
+        )
+        counters = {column: func.coalesce(rolled.c[column], 0) for column in COUNTER_COLUMNS}
+        frame = {"order_by": buckets.c.bucket, "rows": (-(window - 1), 0)}
+        windowed = (
+            select(
+                buckets.c.bucket,
+                *[value.label(column) for column, value in counters.items()],
+                func.sum(counters["ratings_sum"]).over(**frame).label("rolling_sum"),
+                func.sum(counters["ratings_count"]).over(**frame).label("rolling_count"),
+            )
+            .select_from(buckets.outerjoin(rolled, rolled.c.bucket == buckets.c.bucket))
+            .subquery("windowed")
+        )
+        statement = select(windowed).where(windowed.c.bucket >= _truncate(unit, start)).order_by(windowed.c.bucket)
+        return self.db.execute(statement).all()
+
+    def _aggregate_query(self):
+        return select(
+            MovieRating.movie_id.label("movie_id"),
+            func.coalesce(func.sum(MovieRating.score), 0).label("ratings_sum"),
+            func.count(MovieRating.id).label("ratings_count"),
+            *[func.count(MovieRating.id).filter(MovieRating.score == score).label(f"score_{score}") for score in SCORE_VALUES],
+            func.max(MovieRating.rated_at).label("last_rated_at"),
+        ).group_by(MovieRating.movie_id)
+
+    def _daily_aggregate_query(self):
+        day = utc_day(MovieRating.rated_at)
+        return select(
+            MovieRating.movie_id.label("movie_id"),
+            day.label("day"),
+            func.coalesce(func.sum(MovieRating.score), 0).label("ratings_sum"),
+            func.count(MovieRating.id).label("ratings_count"),
+            *[func.count(MovieRating.id).filter(MovieRating.score == score).label(f"score_{score}") for score in SCORE_VALUES],
+        ).group_by(MovieRating.movie_id, day)
+
+    def rebuild(self, movie_ids: Optional[Iterable[int]] = None) -> int:
+        """Recompute aggregates and daily rollups from movie_ratings, either for all movies or the given ones."""
+        aggregate = self._aggregate_query()
+        daily_aggregate = self._daily_aggregate_query()
+        clear = delete(MovieRatingStats)
+        clear_daily = delete(MovieRatingDaily)
+        if movie_ids is not None:
+            movie_ids = list(movie_ids)
+            aggregate = aggregate.where(MovieRating.movie_id.in_(movie_ids))
+            daily_aggregate = daily_aggregate.where(MovieRating.movie_id.in_(movie_ids))
+            clear = clear.where(MovieRatingStats.movie_id.in_(movie_ids))
+            clear_daily = clear_daily.where(MovieRatingDaily.movie_id.in_(movie_ids))
+
+        self.db.execute(clear)
+        self.db.execute(clear_daily)
+        result = self.db.execute(insert(MovieRatingStats).from_select(["movie_id"] + COUNTER_COLUMNS + ["last_rated_at"], aggregate))
+        self.db.execute(insert(MovieRatingDaily).from_select(["movie_id", "day"] + COUNTER_COLUMNS, daily_aggregate))
+        self.db.commit()
+        return result.rowcount
+
+    def find_drift(self) -> list[int]:
+        """Return ids of movies whose stored aggregates disagree with movie_ratings."""
+        actual = self._aggregate_query().subquery()
+        stored = select(MovieRatingStats).where(MovieRatingStats.ratings_count > 0).subquery()
+        mismatch = [
+            func.coalesce(getattr(actual.c, column), 0) != func.coalesce(getattr(stored.c, column), 0)
+            for column in COUNTER_COLUMNS
+        ]
+        movie_id = func.coalesce(actual.c.movie_id, stored.c.movie_id)
+        query = (
+            select(movie_id)
+            .select_from(actual.join(stored, actual.c.movie_id == stored.c.movie_id, full=True))
+            .where(or_(*mismatch))
+            .order_by(movie_id)
+        )
+        return list(self.db.execute(query).scalars())
@@ -1,8 +1,11 @@
-from typing import Optional, List
+from typing import Optional, List, Literal
 from pydantic import BaseModel, Field
 from app.schemas.director import DirectorBase, DirectorDetail
 from datetime import datetime
 
+MovieSort = Literal["id", "title", "release_year", "relevance", "average_rating", "ratings_count", "weighted", "trending"]
+CountMode = Literal["exact", "estimate", "none"]
+
 
 class MovieCreate(BaseModel):
     title: str
@@ -12,6 +15,21 @@ class MovieCreate(BaseModel):
     genres: List[int] = Field(default_factory=list)
 
 
+class MovieImportItem(MovieCreate):
+    description: Optional[str] = None
+
+
+class MovieImportError(BaseModel):
+    index: int
+    message: str
+
+
+class MovieImportResult(BaseModel):
+    accepted: int = 0
+    rejected: int = 0
+    errors: List[MovieImportError] = Field(default_factory=list)
+
+
 class MovieUpdate(BaseModel):
     title: Optional[str] = None
     release_year: Optional[int] = None
@@ -48,8 +66,11 @@ class PaginationMeta(BaseModel):
 
 
 class MovieListResponse(BaseModel):
-    page: int
+    page: Optional[int] = None
     page_size: int
-    total_items: int
+    total_items: Optional[int] = None
+    has_more: bool = False
     items: List[MovieListItem]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
@@ -1,5 +1,9 @@
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
+
+StatsInterval = Literal["day", "week"]
+RatingOrder = Literal["asc", "desc"]
 
 
 class RatingCreate(BaseModel):
@@ -12,3 +16,61 @@ class RatingResponse(BaseModel):
     score: int
     created_at: datetime  # This will be mapped from rated_at field
 
+
+class RatingListItem(BaseModel):
+    rating_id: int
+    score: int
+    created_at: datetime
+
+
+class RatingListResponse(BaseModel):
+    movie_id: int
+    page_size: int
+    has_more: bool = False
+    items: List[RatingListItem]
+    next_cursor: Optional[str] = None
+
+
+class RatingAcceptedResponse(BaseModel):
+    movie_id: int
+    score: int
+    status: str = "queued"
+
+
+class BulkRatingError(BaseModel):
+    index: int
+    movie_id: Optional[int] = None
+    score: Optional[int] = None
+    message: str
+
+
+class BulkRatingResult(BaseModel):
+    accepted: int = 0
+    rejected: int = 0
+    errors: List[BulkRatingError] = Field(default_factory=list)
+
+
+class RatingSummary(BaseModel):
+    ratings_count: int = 0
+    average_rating: Optional[float] = None
+    histogram: Dict[int, int]
+
+
+class RatingBucket(BaseModel):
+    start: date
+    ratings_count: int = 0
+    average_rating: Optional[float] = None
+    # Average over this bucket and the `window - 1` buckets before it
+    rolling_average: Optional[float] = None
+    histogram: Dict[int, int]
+
+
+class RatingStatsResponse(BaseModel):
+    movie_id: int
+    interval: StatsInterval
+    start: date
+    end: date
+    window: int
+    overall: RatingSummary
+    period: RatingSummary
+    buckets: List[RatingBucket]
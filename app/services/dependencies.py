@@ -1,27 +1,68 @@
+from typing import Union
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.cache import director_cache, genre_cache, known_movie_ids, movie_cache
+from app.db.session import get_request_db, get_request_read_db
 from app.repositories.dependencies import (
     get_director_repository,
     get_genre_repository,
     get_movie_repository,
     get_rating_repository,
+    get_rating_stats_repository,
 )
 from app.services.movie import MovieService
 from app.services.rating import RatingService
+from app.services.rating_buffer import rating_buffer
+from app.services.runner import ServiceRunner
 
 
-def get_movie_service(db: Session = Depends(get_db)) -> MovieService:
+def build_movie_service(db: Session) -> MovieService:
     """Create MovieService with all repositories using the same db session."""
     director_repo = get_director_repository(db)
     genre_repo = get_genre_repository(db)
     movie_repo = get_movie_repository(db)
-    return MovieService(db=db, director_repo=director_repo, genre_repo=genre_repo, movie_repo=movie_repo)
+    return MovieService(
+        db=db,
+        director_repo=director_repo,
+        genre_repo=genre_repo,
+        movie_repo=movie_repo,
+        cache=movie_cache,
+        known_ids=known_movie_ids,
+        genre_cache=genre_cache,
+        director_cache=director_cache,
+    )
 
 
-def get_rating_service(db: Session = Depends(get_db)) -> RatingService:
+def build_rating_service(db: Session) -> RatingService:
     """Create RatingService with all repositories using the same db session."""
     rating_repo = get_rating_repository(db)
     movie_repo = get_movie_repository(db)
-    return RatingService(db=db, rating_repo=rating_repo, movie_repo=movie_repo)
+    stats_repo = get_rating_stats_repository(db)
+    return RatingService(
+        db=db,
+        rating_repo=rating_repo,
+        movie_repo=movie_repo,
+        stats_repo=stats_repo,
+        cache=movie_cache,
+        buffer=rating_buffer,
+        known_ids=known_movie_ids,
+    )
 
+
+def get_movie_service(db: Union[Session, AsyncSession] = Depends(get_request_db)) -> ServiceRunner[MovieService]:
+    return ServiceRunner(db, build_movie_service)
+
+
+def get_movie_read_service(db: Union[Session, AsyncSession] = Depends(get_request_read_db)) -> ServiceRunner[MovieService]:
+    """MovieService for read-only methods; its session may be bound to a read replica."""
+    return ServiceRunner(db, build_movie_service)
+
+
+def get_rating_service(db: Union[Session, AsyncSession] = Depends(get_request_db)) -> ServiceRunner[RatingService]:
+    return ServiceRunner(db, build_rating_service)
+
+
+def get_rating_read_service(db: Union[Session, AsyncSession] = Depends(get_request_read_db)) -> ServiceRunner[RatingService]:
+    """RatingService for read-only methods; its session may be bound to a read replica."""
+    return ServiceRunner(db, build_rating_service)
@@ -1,28 +1,127 @@
-from typing import Optional
+from datetime import datetime
+from typing import Any, Optional
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from app.repositories.movie import MovieRepository
 from app.repositories.director import DirectorRepository
 from app.repositories.genre import GenreRepository
-from app.schemas.movie import MovieCreate, MovieUpdate, MovieListItem, MovieDetail, MovieListResponse
+from app.schemas.movie import (
+    MovieCreate,
+    MovieUpdate,
+    MovieListItem,
+    MovieDetail,
+    MovieListResponse,
+    MovieImportItem,
+    MovieImportError,
+    MovieImportResult,
+)
 from app.schemas.director import DirectorBase, DirectorDetail
 from app.exceptions.movie import MovieNotFoundError, DirectorNotFoundError, GenreNotFoundError, InvalidReleaseYearError
+from app.exceptions.pagination import InvalidCursorError, InvalidSortError
+from app.utils.cursor import encode_cursor, decode_cursor, valid_cursor_value
 from app.models.movie import Movie
+from app.cache.movie import MovieCache
+from app.cache.movie_ids import KnownMovieIds
+from app.cache.reference import DirectorCache, GenreCache, GenreSnapshot
+from app.db.session import is_replica_session
+
+# Type of the sort key a cursor may carry, per sort; anything else is a tampered cursor
+CURSOR_KEY_TYPES = {
+    "id": (int,),
+    "title": (str,),
+    "release_year": (int,),
+    "relevance": (int, float),
+    "average_rating": (int, float),
+    "ratings_count": (int,),
+    "weighted": (int, float),
+    "trending": (int,),
+}
 
 
 class MovieService:
-    def __init__(self, db: Session, director_repo: DirectorRepository, genre_repo: GenreRepository, movie_repo: MovieRepository):
+    def __init__(
+        self,
+        db: Session,
+        director_repo: DirectorRepository,
+        genre_repo: GenreRepository,
+        movie_repo: MovieRepository,
+        cache: Optional[MovieCache] = None,
+        known_ids: Optional[KnownMovieIds] = None,
+        genre_cache: Optional[GenreCache] = None,
+        director_cache: Optional[DirectorCache] = None,
+    ):
         self.db = db
         self.movie_repo = movie_repo
         self.director_repo = director_repo
         self.genre_repo = genre_repo
+        self.cache = cache
+        self.known_ids = known_ids
+        self.genre_cache = genre_cache
+        self.director_cache = director_cache
 
     def get_movie_list(
-        self, page: int = 1, page_size: int = 10, title: Optional[str] = None, release_year: Optional[int] = None, genre: Optional[str] = None
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        title: Optional[str] = None,
+        release_year: Optional[int] = None,
+        genre: Optional[str] = None,
+        sort: str = "id",
+        cursor: Optional[str] = None,
+        count: str = "exact",
     ) -> MovieListResponse:
         if release_year is not None and (not isinstance(release_year, int) or release_year < 1800 or release_year > 2100):
             raise InvalidReleaseYearError(release_year)
 
-        movies_with_stats, total_items = self.movie_repo.get_list_with_stats(page=page, page_size=page_size, title=title, release_year=release_year, genre_name=genre)
+        if sort == "relevance" and not title:
+            raise InvalidSortError("sort=relevance requires a title filter")
+
+        after, backward = None, False
+        if cursor:
+            position = decode_cursor(cursor)
+            if (
+                position.get("s") != sort
+                or not valid_cursor_value(position.get("k"), CURSOR_KEY_TYPES[sort])
+                or not valid_cursor_value(position.get("id"), (int,))
+            ):
+                raise InvalidCursorError()
+            after, backward = (position["k"], position["id"]), position.get("d") == "prev"
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.list_key(
+                {
+                    "page": None if cursor else page,
+                    "page_size": page_size,
+                    # The title filter and relevance ranking are case-insensitive
+                    "title": title.lower() if title else None,
+                    "release_year": release_year,
+                    "genre": genre,
+                    "sort": sort,
+                    "cursor": cursor,
+                    "count": count,
+                }
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        genre_id = self._resolve_genre_id(genre) if genre else None
+        if genre and genre_id is None:
+            # No movie can match a genre that does not exist
+            movies_with_stats, total_items, has_more, sort_keys = [], None if count == "none" else 0, False, []
+        else:
+            movies_with_stats, total_items, has_more, sort_keys = self.movie_repo.get_list_with_stats(
+                page=page,
+                page_size=page_size,
+                title=title,
+                release_year=release_year,
+                genre_id=genre_id,
+                sort=sort,
+                after=after,
+                backward=backward,
+                count=count,
+            )
 
         items = []
         for movie, avg_rating, ratings_count in movies_with_stats:
@@ -38,16 +137,63 @@ class MovieService:
                 )
             )
 
-        return MovieListResponse(page=page, page_size=page_size, total_items=total_items, items=items)
+        next_cursor = prev_cursor = None
+        has_next = bool(movies_with_stats) and (backward or has_more)
+        if movies_with_stats:
+            first, last = movies_with_stats[0][0], movies_with_stats[-1][0]
+            has_prev = has_more if backward else (after is not None or page > 1)
+            if has_next:
+                next_cursor = encode_cursor({"s": sort, "k": sort_keys[-1], "id": last.id, "d": "next"})
+            if has_prev:
+                prev_cursor = encode_cursor({"s": sort, "k": sort_keys[0], "id": first.id, "d": "prev"})
+
+        response = MovieListResponse(
+            page=None if cursor else page,
+            page_size=page_size,
+            total_items=total_items,
+            has_more=has_next,
+            items=items,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+        if cache_key is not None:
+            self.cache.set(cache_key, response, from_replica=is_replica_session(self.db))
+        return response
+
+    def get_movie_validators(self, movie_id: int) -> tuple[str, datetime]:
+        """Return the movie's ETag and Last-Modified without loading the movie itself."""
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.detail_key(movie_id) + ":validators"
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = self.movie_repo.get_validators(movie_id)
+        if not result:
+            raise MovieNotFoundError(movie_id)
+
+        version, updated_at, ratings_count, last_rated_at = result
+        validators = f'W/"{movie_id}-{version}-{ratings_count}"', max(filter(None, (updated_at, last_rated_at)))
+        if cache_key is not None:
+            self.cache.set(cache_key, validators, movie_id=movie_id, from_replica=is_replica_session(self.db))
+        return validators
 
     def get_movie_by_id(self, movie_id: int) -> MovieDetail:
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.detail_key(movie_id)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         result = self.movie_repo.get_movie_with_stats(movie_id)
         if not result:
             raise MovieNotFoundError(movie_id)
 
         movie, avg_rating, ratings_count = result
 
-        return MovieDetail(
+        detail = MovieDetail(
             id=movie.id,
             title=movie.title,
             release_year=movie.release_year,
@@ -58,44 +204,90 @@ class MovieService:
             average_rating=round(avg_rating, 2) if avg_rating else None,
             ratings_count=ratings_count,
         )
+        if cache_key is not None:
+            self.cache.set(cache_key, detail, movie_id=movie_id, from_replica=is_replica_session(self.db))
+        return detail
 
     def create_movie(self, movie_data: MovieCreate) -> MovieDetail:
-        director = self.director_repo.get_by_id(movie_data.director_id)
+        director = self._get_director(movie_data.director_id)
         if not director:
             raise DirectorNotFoundError(movie_data.director_id)
 
-        if movie_data.genres:
-            genres = self.genre_repo.get_by_ids(movie_data.genres)
-            if len(genres) != len(movie_data.genres):
-                found_ids = {g.id for g in genres}
-                missing_ids = [gid for gid in movie_data.genres if gid not in found_ids]
-                raise GenreNotFoundError(missing_ids[0] if missing_ids else 0)
+        genre_names = self._get_genre_names(movie_data.genres) if movie_data.genres else {}
+        missing_ids = [gid for gid in movie_data.genres if gid not in genre_names]
+        if missing_ids:
+            raise GenreNotFoundError(missing_ids[0])
 
-        movie = self.movie_repo.create(
+        movie_id = self.movie_repo.create(
             title=movie_data.title,
             director_id=movie_data.director_id,
             release_year=movie_data.release_year,
             cast=movie_data.cast,
             genre_ids=movie_data.genres,
         )
+        if self.cache is not None:
+            self.cache.invalidate_lists()
+        if self.known_ids is not None:
+            self.known_ids.add(movie_id)
 
         return MovieDetail(
-            id=movie.id,
-            title=movie.title,
-            release_year=movie.release_year,
-            cast=movie.cast,
-            description=movie.description,
-            director=DirectorDetail(id=movie.director.id, name=movie.director.name, birth_year=movie.director.birth_year, description=movie.director.description),
-            genres=[genre.name for genre in movie.genres],
+            id=movie_id,
+            title=movie_data.title,
+            release_year=movie_data.release_year,
+            cast=movie_data.cast,
+            description=None,
+            director=director,
+            genres=[genre_names[gid] for gid in dict.fromkeys(movie_data.genres)],
             average_rating=None,
             ratings_count=0,
         )
 
-    def update_movie(self, movie_id: int, movie_data: MovieUpdate) -> MovieDetail:
-        movie = self.movie_repo.get_by_id(movie_id)
-        if not movie:
-            raise MovieNotFoundError(movie_id)
+    def import_movies(self, items: list[Any], start_index: int = 0) -> MovieImportResult:
+        """Validate and insert a chunk of movies in one transaction.
 
+        Directors and genres are checked against the reference caches, with at most one query each for
+        the ids they do not hold; invalid items are reported by index and skipped.
+        """
+        result = MovieImportResult()
+        candidates: list[tuple[int, MovieImportItem]] = []
+        for index, item in enumerate(items, start=start_index):
+            try:
+                candidates.append((index, MovieImportItem.model_validate(item)))
+            except ValidationError as e:
+                error = e.errors()[0]
+                field = " -> ".join(str(part) for part in error["loc"]) or "item"
+                result.errors.append(MovieImportError(index=index, message=f"{field}: {error['msg']}"))
+
+        director_ids = self._get_existing_director_ids({movie.director_id for _, movie in candidates})
+        requested_genre_ids = {genre_id for _, movie in candidates for genre_id in movie.genres}
+        genre_ids = set(self._get_genre_names(list(requested_genre_ids))) if requested_genre_ids else set()
+
+        movies = []
+        for index, movie in candidates:
+            missing_genres = [genre_id for genre_id in movie.genres if genre_id not in genre_ids]
+            if movie.director_id not in director_ids:
+                result.errors.append(MovieImportError(index=index, message=DirectorNotFoundError(movie.director_id).message))
+            elif missing_genres:
+                result.errors.append(MovieImportError(index=index, message=GenreNotFoundError(missing_genres[0]).message))
+            else:
+                movies.append(movie)
+
+        movie_ids = self.movie_repo.bulk_create(
+            [movie.model_dump(exclude={"genres"}) for movie in movies], [movie.genres for movie in movies]
+        )
+        if movie_ids:
+            if self.cache is not None:
+                self.cache.invalidate_lists()
+            if self.known_ids is not None:
+                self.known_ids.update(set(movie_ids))
+
+        result.accepted = len(movie_ids)
+        result.rejected = len(result.errors)
+        result.errors.sort(key=lambda error: error.index)
+        return result
+
+    def update_movie(self, movie_id: int, movie_data: MovieUpdate) -> MovieDetail:
+        """Apply the update in a single transaction: UPDATE ... RETURNING, then diff the genre links."""
         update_data = {}
         if movie_data.title is not None:
             update_data["title"] = movie_data.title
@@ -104,40 +296,96 @@ class MovieService:
         if movie_data.cast is not None:
             update_data["cast"] = movie_data.cast
 
-        if update_data:
-            self.movie_repo.update(movie, **update_data)
+        try:
+            row = self.movie_repo.update_returning(movie_id, **update_data)
+            if row is None:
+                raise MovieNotFoundError(movie_id)
+            if movie_data.genres is not None:
+                names = self._get_genre_names(movie_data.genres) if movie_data.genres else {}
+                missing_ids = [gid for gid in movie_data.genres if gid not in names]
+                if missing_ids:
+                    raise GenreNotFoundError(missing_ids[0])
+                self.movie_repo.replace_genres(movie_id, movie_data.genres)
+                genre_names = [names[gid] for gid in dict.fromkeys(movie_data.genres)]
+            else:
+                genre_names = self.movie_repo.get_genre_names(movie_id)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
 
-        if movie_data.genres is not None:
-            genres = self.genre_repo.get_by_ids(movie_data.genres)
-            if len(genres) != len(movie_data.genres):
-                found_ids = {g.id for g in genres}
-                missing_ids = [gid for gid in movie_data.genres if gid not in found_ids]
-                raise GenreNotFoundError(missing_ids[0] if missing_ids else 0)
-            self.movie_repo.update_genres(movie, movie_data.genres)
-
-        self.db.refresh(movie)
-        result = self.movie_repo.get_movie_with_stats(movie_id)
-        if not result:
-            raise MovieNotFoundError(movie_id)
-
-        movie, avg_rating, ratings_count = result
+        if self.cache is not None:
+            self.cache.invalidate_movie(movie_id)
 
+        avg_rating = row.ratings_sum / row.ratings_count if row.ratings_count else None
         return MovieDetail(
-            id=movie.id,
-            title=movie.title,
-            release_year=movie.release_year,
-            cast=movie.cast,
-            description=movie.description,
-            director=DirectorDetail(id=movie.director.id, name=movie.director.name, birth_year=movie.director.birth_year, description=movie.director.description),
-            genres=[genre.name for genre in movie.genres],
+            id=row.id,
+            title=row.title,
+            release_year=row.release_year,
+            cast=row.cast,
+            description=row.description,
+            director=DirectorDetail(id=row.director_id, name=row.director_name, birth_year=row.director_birth_year, description=row.director_description),
+            genres=genre_names,
             average_rating=round(avg_rating, 2) if avg_rating else None,
-            ratings_count=ratings_count,
+            ratings_count=row.ratings_count or 0,
         )
 
     def delete_movie(self, movie_id: int) -> None:
-        movie = self.movie_repo.get_by_id(movie_id)
-        if not movie:
+        if not self.movie_repo.delete_by_id(movie_id):
             raise MovieNotFoundError(movie_id)
 
-        self.movie_repo.delete(movie)
+        if self.known_ids is not None:
+            self.known_ids.discard(movie_id)
+        if self.cache is not None:
+            self.cache.invalidate_movie(movie_id)
+
+    def _get_director(self, director_id: int) -> Optional[DirectorDetail]:
+        if self.director_cache is not None:
+            cached = self.director_cache.get(director_id)
+            if cached is not None:
+                return cached
+
+        director = self.director_repo.get_by_id(director_id)
+        if not director:
+            return None
+        detail = DirectorDetail(id=director.id, name=director.name, birth_year=director.birth_year, description=director.description)
+        if self.director_cache is not None:
+            self.director_cache.set(detail)
+        return detail
+
+    def _get_existing_director_ids(self, director_ids: set[int]) -> set[int]:
+        cached = set()
+        if self.director_cache is not None:
+            cached = {director_id for director_id in director_ids if self.director_cache.get(director_id) is not None}
+        return cached | self.director_repo.get_existing_ids(director_ids - cached)
+
+    def _genre_snapshot(self) -> Optional[GenreSnapshot]:
+        """The cached genre table, loaded from the database if it expired or was invalidated."""
+        if self.genre_cache is None:
+            return None
+        snapshot = self.genre_cache.snapshot()
+        if snapshot is None:
+            snapshot = self.genre_cache.load((genre.id, genre.name) for genre in self.genre_repo.get_all())
+        return snapshot
+
+    def _get_genre_names(self, genre_ids: list[int]) -> dict[int, str]:
+        """Map genre ids to names; ids that do not exist are left out."""
+        snapshot = self._genre_snapshot()
+        names = {gid: snapshot.names_by_id[gid] for gid in genre_ids if gid in snapshot.names_by_id} if snapshot else {}
+        missing_ids = {gid for gid in genre_ids if gid not in names}
+        if missing_ids:
+            # A miss is confirmed against the database: the genre may have been added since the snapshot
+            found = self.genre_repo.get_by_ids(list(missing_ids))
+            if found and self.genre_cache is not None:
+                self.genre_cache.invalidate()
+            names.update({genre.id: genre.name for genre in found})
+        return names
 
+    def _resolve_genre_id(self, name: str) -> Optional[int]:
+        snapshot = self._genre_snapshot()
+        if snapshot is not None and name in snapshot.ids_by_name:
+            return snapshot.ids_by_name[name]
+        genre = self.genre_repo.get_by_name(name)
+        if genre and self.genre_cache is not None:
+            self.genre_cache.invalidate()
+        return genre.id if genre else None
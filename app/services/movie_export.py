@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+from typing import Iterator
+from sqlalchemy.orm import Session
+from app.repositories.movie import MovieRepository
+
+EXPORT_FIELDS = ["id", "title", "director_id", "release_year", "cast", "description", "genres", "average_rating", "ratings_count"]
+
+
+def _export_record(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "director_id": row.director_id,
+        "release_year": row.release_year,
+        "cast": row.cast,
+        "description": row.description,
+        "genres": row.genres or [],
+        "average_rating": round(row.ratings_sum / row.ratings_count, 2) if row.ratings_count else None,
+        "ratings_count": row.ratings_count or 0,
+    }
+
+
+def iter_movie_export(db: Session, export_format: str, batch_size: int) -> Iterator[bytes]:
+    """Stream the whole catalogue as NDJSON or CSV, one encoded batch of rows per chunk.
+
+    Rows come from a server-side cursor, so memory stays flat regardless of catalogue size. The CSV
+    `genres` column holds `;`-separated ids, the format accepted by the import endpoint.
+    """
+    rows = MovieRepository(db).iter_export_rows(batch_size)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, lineterminator="\n") if export_format == "csv" else None
+    if writer is not None:
+        writer.writeheader()
+
+    pending = 0
+    for row in rows:
+        record = _export_record(row)
+        if writer is not None:
+            writer.writerow({**record, "genres": ";".join(str(genre_id) for genre_id in record["genres"])})
+        else:
+            buffer.write(json.dumps(record, ensure_ascii=False))
+            buffer.write("\n")
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session, sessionmaker
+from app.cache import movie_cache
+from app.cache.movie import MovieCache
+from app.config import settings
+from app.db.session import SessionLocal
+from app.repositories.movie_ranking import MovieRankingRepository
+
+logger = logging.getLogger(__name__)
+
+# Movies rated this long before the previous refresh are re-read, so ratings committed by
+# transactions that were still open during that refresh are not missed
+REFRESH_OVERLAP = timedelta(seconds=60)
+# Recompute every weighted rating once the global mean has moved this much since the last full refresh
+MEAN_TOLERANCE = 0.01
+
+
+class MovieRankingRefresher:
+    """Keeps movie_rankings up to date from movie_rating_stats and movie_rating_daily.
+
+    The first refresh recomputes every rated movie; later ones only movies rated since the previous
+    refresh, plus the trending counts that changed as the window moved.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        interval: float,
+        min_votes: int,
+        trending_days: int,
+        cache: Optional[MovieCache] = None,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.min_votes = min_votes
+        self.trending_days = trending_days
+        self.cache = cache
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._watermark: Optional[datetime] = None
+        self._mean: Optional[float] = None
+        self._refreshes = 0
+        self._skipped = 0
+        self._failures = 0
+        self._last_refresh_at: Optional[datetime] = None
+        self._last_duration_ms: Optional[float] = None
+        self._last_rows: Optional[int] = None
+        self._last_full = False
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="movie-ranking-refresher", daemon=True)
+        self._thread.start()
+        logger.info("Movie ranking refresher started (interval=%ss)", self.interval)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Movie ranking refresher stopped (refreshes=%s)", self._refreshes)
+
+    def refresh(self, full: bool = False) -> Optional[int]:
+        """Run one refresh in its own transaction; returns the rows changed, or None if another refresh holds the lock."""
+        started = time.perf_counter()
+        db: Session = self.session_factory()
+        try:
+            repo = MovieRankingRepository(db)
+            if not repo.try_lock():
+                with self._lock:
+                    self._skipped += 1
+                return None
+
+            now = repo.now()
+            mean = repo.global_mean()
+            with self._lock:
+                watermark, previous_mean = self._watermark, self._mean
+            full = full or watermark is None or previous_mean is None
+            if mean is not None and not full and abs(mean - previous_mean) > MEAN_TOLERANCE:
+                full = True
+
+            rows = 0
+            if mean is not None:
+                rows += repo.upsert_from_stats(mean, self.min_votes, since=None if full else watermark - REFRESH_OVERLAP)
+            if full:
+                rows += repo.delete_unrated()
+            rows += repo.update_trending(self.trending_days)
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._failures += 1
+            raise
+        finally:
+            db.close()
+
+        if rows and self.cache is not None:
+            self.cache.invalidate_lists()
+        duration_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._watermark = now
+            if full or self._mean is None:
+                self._mean = mean
+            self._refreshes += 1
+            self._last_refresh_at = now
+            self._last_duration_ms = round(duration_ms, 2)
+            self._last_rows = rows
+            self._last_full = full
+        logger.info("Movie rankings refreshed (full=%s, rows=%s, duration_ms=%.1f)", full, rows, duration_ms)
+        return rows
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "interval_seconds": self.interval,
+                "min_votes": self.min_votes,
+                "trending_days": self.trending_days,
+                "global_mean": self._mean,
+                "refreshes": self._refreshes,
+                "skipped": self._skipped,
+                "failures": self._failures,
+                "last_refresh_at": self._last_refresh_at.isoformat() if self._last_refresh_at else None,
+                "last_duration_ms": self._last_duration_ms,
+                "last_rows": self._last_rows,
+                "last_full": self._last_full,
+            }
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.error("Failed to refresh movie rankings", exc_info=True)
+            if self._stop.wait(self.interval):
+                break
+
+
+ranking_refresher: Optional[MovieRankingRefresher] = (
+    MovieRankingRefresher(
+        SessionLocal,
+        interval=settings.RANKING_REFRESH_INTERVAL_SECONDS,
+        min_votes=settings.RANKING_MIN_VOTES,
+        trending_days=settings.RANKING_TRENDING_DAYS,
+        cache=movie_cache,
+    )
+    if settings.RANKING_REFRESH_INTERVAL_SECONDS > 0
+    else None
+)
@@ -1,33 +1,279 @@
 import logging
+from datetime import date, datetime, timezone
+from typing import Any, Optional, Union
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.cache.movie import MovieCache
+from app.cache.movie_ids import KnownMovieIds
+from app.db.errors import is_foreign_key_violation
+from app.db.session import is_replica_session
 from app.repositories.movie_rating import MovieRatingRepository
 from app.repositories.movie import MovieRepository
-from app.schemas.rating import RatingCreate, RatingResponse
+from app.repositories.movie_rating_stats import (
+    BUCKET_STEPS,
+    COUNTER_COLUMNS,
+    MAX_BUCKET_DATE,
+    MIN_BUCKET_DATE,
+    MovieRatingStatsRepository,
+)
+from app.models.movie_rating_stats import SCORE_VALUES
+from app.schemas.rating import (
+    RatingCreate,
+    RatingResponse,
+    RatingAcceptedResponse,
+    BulkRatingError,
+    BulkRatingResult,
+    RatingSummary,
+    RatingBucket,
+    RatingStatsResponse,
+    RatingListItem,
+    RatingListResponse,
+)
 from app.exceptions.movie import MovieNotFoundError
-from app.exceptions.rating import InvalidRatingScoreError
+from app.exceptions.rating import InvalidRatingScoreError, InvalidStatsRangeError
+from app.exceptions.pagination import InvalidCursorError
+from app.metrics import rating_writes_total
+from app.services.rating_buffer import RatingWriteBuffer
+from app.utils.cursor import decode_cursor, encode_cursor, valid_cursor_value
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the buckets of one stats response
+MAX_STATS_BUCKETS = 1000
+# Range returned when no start is given, in buckets
+DEFAULT_STATS_BUCKETS = {"day": 30, "week": 12}
+
+
+def decode_rating_cursor(cursor: Optional[str], order: str) -> Optional[tuple[datetime, int]]:
+    """Turn a ratings cursor back into the (rated_at, id) position it continues after."""
+    if not cursor:
+        return None
+    position = decode_cursor(cursor)
+    if position.get("o") != order or not isinstance(position.get("k"), str) or not valid_cursor_value(position.get("id"), (int,)):
+        raise InvalidCursorError()
+    try:
+        rated_at = datetime.fromisoformat(position["k"])
+    except ValueError:
+        raise InvalidCursorError()
+    # rated_at is timestamptz: a naive timestamp could only come from a tampered cursor
+    if rated_at.tzinfo is None:
+        raise InvalidCursorError()
+    return rated_at, position["id"]
+
+
+def _average(ratings_sum: int, ratings_count: int) -> Optional[float]:
+    return round(ratings_sum / ratings_count, 2) if ratings_count else None
+
+
+def _summary(counters: dict[str, int]) -> RatingSummary:
+    return RatingSummary(
+        ratings_count=counters["ratings_count"],
+        average_rating=_average(counters["ratings_sum"], counters["ratings_count"]),
+        histogram={score: counters[f"score_{score}"] for score in SCORE_VALUES},
+    )
+
+
+def _accept_existing(candidates: list[tuple[int, int, int]], existing_ids: set[int], result: BulkRatingResult) -> list[tuple[int, int, int]]:
+    """Keep the (index, movie_id, score) candidates whose movie exists; report the others in result.errors."""
+    accepted = []
+    for index, movie_id, score in candidates:
+        if movie_id in existing_ids:
+            accepted.append((index, movie_id, score))
+        else:
+            result.errors.append(BulkRatingError(index=index, movie_id=movie_id, score=score, message=MovieNotFoundError(movie_id).message))
+    return accepted
+
 
 class RatingService:
-    def __init__(self, db: Session, rating_repo: MovieRatingRepository, movie_repo: MovieRepository):
+    def __init__(
+        self,
+        db: Session,
+        rating_repo: MovieRatingRepository,
+        movie_repo: MovieRepository,
+        stats_repo: MovieRatingStatsRepository,
+        cache: Optional[MovieCache] = None,
+        buffer: Optional[RatingWriteBuffer] = None,
+        known_ids: Optional[KnownMovieIds] = None,
+    ):
         self.db = db
         self.rating_repo = rating_repo
         self.movie_repo = movie_repo
+        self.stats_repo = stats_repo
+        self.cache = cache
+        self.buffer = buffer
+        self.known_ids = known_ids
 
-    def create_rating(self, movie_id: int, rating_data: RatingCreate) -> RatingResponse:
-        movie = self.movie_repo.get_by_id(movie_id)
-        if not movie:
+    def _ensure_movie_exists(self, movie_id: int) -> None:
+        if self.known_ids is not None and movie_id in self.known_ids:
+            return
+        if not self.movie_repo.exists(movie_id):
             raise MovieNotFoundError(movie_id)
+        if self.known_ids is not None:
+            self.known_ids.add(movie_id)
+
+    def create_rating(self, movie_id: int, rating_data: RatingCreate) -> Union[RatingResponse, RatingAcceptedResponse]:
+        """Store a rating, or queue it for a batched commit when the write-behind buffer is enabled."""
+        self._ensure_movie_exists(movie_id)
 
         if not (1 <= rating_data.score <= 10):
-            logger.warning(f"Invalid rating value (movie_id={movie_id}, rating={rating_data.score}, route=/api/v1/movies/{movie_id}/ratings)")
+            logger.warning("Invalid rating value (movie_id=%s, rating=%s, route=/api/v1/movies/%s/ratings)", movie_id, rating_data.score, movie_id)
             raise InvalidRatingScoreError(rating_data.score)
 
+        if self.buffer is not None:
+            self.buffer.submit(movie_id, rating_data.score)
+            rating_writes_total.inc(labels=("queued",))
+            return RatingAcceptedResponse(movie_id=movie_id, score=rating_data.score)
+
         try:
             rating = self.rating_repo.create(movie_id=movie_id, score=rating_data.score)
-            logger.info(f"Rating saved successfully (movie_id={movie_id}, rating={rating_data.score})")
+            rating_writes_total.inc(labels=("direct",))
+            if self.cache is not None:
+                self.cache.invalidate_movie(movie_id, lists=False)
+            logger.info("Rating saved successfully (movie_id=%s, rating=%s)", movie_id, rating_data.score)
             return RatingResponse(rating_id=rating.id, movie_id=rating.movie_id, score=rating.score, created_at=rating.rated_at)
+        except IntegrityError as e:
+            self.db.rollback()
+            if not is_foreign_key_violation(e):
+                raise
+            # The movie was deleted after it was remembered as existing
+            if self.known_ids is not None:
+                self.known_ids.discard(movie_id)
+            raise MovieNotFoundError(movie_id)
         except Exception as e:
-            logger.error(f"Failed to save rating (movie_id={movie_id}, rating={rating_data.score})", exc_info=True)
+            logger.error("Failed to save rating (movie_id=%s, rating=%s)", movie_id, rating_data.score, exc_info=True)
             raise
+
+    def ingest_ratings(self, items: list[Any], start_index: int = 0) -> BulkRatingResult:
+        """Validate and store a chunk of {"movie_id", "score"} items in one transaction.
+
+        Invalid items are reported per index and skipped; valid ones are written together.
+        """
+        result = BulkRatingResult()
+        candidates: list[tuple[int, int, int]] = []
+        for index, item in enumerate(items, start=start_index):
+            movie_id = item.get("movie_id") if isinstance(item, dict) else None
+            score = item.get("score") if isinstance(item, dict) else None
+            if (
+                not isinstance(movie_id, int)
+                or isinstance(movie_id, bool)
+                or not isinstance(score, int)
+                or isinstance(score, bool)
+            ):
+                result.errors.append(BulkRatingError(index=index, message="Item must be an object with integer movie_id and score"))
+            elif not (1 <= score <= 10):
+                result.errors.append(
+                    BulkRatingError(index=index, movie_id=movie_id, score=score, message=InvalidRatingScoreError(score).message)
+                )
+            else:
+                candidates.append((index, movie_id, score))
+
+        candidate_ids = {movie_id for _, movie_id, _ in candidates}
+        unknown_ids = {movie_id for movie_id in candidate_ids if movie_id not in self.known_ids} if self.known_ids is not None else candidate_ids
+        found_ids = self.movie_repo.get_existing_ids(unknown_ids)
+        if self.known_ids is not None:
+            self.known_ids.update(found_ids)
+        accepted = _accept_existing(candidates, (candidate_ids - unknown_ids) | found_ids, result)
+
+        try:
+            self.rating_repo.bulk_create([(movie_id, score) for _, movie_id, score in accepted])
+        except IntegrityError as e:
+            self.db.rollback()
+            if not is_foreign_key_violation(e):
+                raise
+            # A movie was deleted after it was checked or remembered as existing: re-check the chunk's movies once
+            retry_ids = {movie_id for _, movie_id, _ in accepted}
+            if self.known_ids is not None:
+                for movie_id in retry_ids:
+                    self.known_ids.discard(movie_id)
+            existing_ids = self.movie_repo.get_existing_ids(retry_ids)
+            if self.known_ids is not None:
+                self.known_ids.update(existing_ids)
+            accepted = _accept_existing(accepted, existing_ids, result)
+            self.rating_repo.bulk_create([(movie_id, score) for _, movie_id, score in accepted])
+
+        ratings = [(movie_id, score) for _, movie_id, score in accepted]
+        rating_writes_total.inc(len(ratings), labels=("bulk",))
+        if self.cache is not None:
+            for movie_id in {movie_id for movie_id, _ in ratings}:
+                self.cache.invalidate_movie(movie_id, lists=False)
+
+        result.accepted = len(ratings)
+        result.rejected = len(result.errors)
+        result.errors.sort(key=lambda error: error.index)
+        logger.info("Bulk ratings ingested (accepted=%s, rejected=%s)", result.accepted, result.rejected)
+        return result
+
+    def get_movie_ratings(self, movie_id: int, page_size: int = 100, cursor: Optional[str] = None, order: str = "desc") -> RatingListResponse:
+        """A page of the movie's ratings ordered by (rated_at, id), continued with `next_cursor`."""
+        after = decode_rating_cursor(cursor, order)
+        self._ensure_movie_exists(movie_id)
+
+        rows = self.rating_repo.get_page(movie_id, page_size + 1, descending=order == "desc", after=after)
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor({"o": order, "k": last.rated_at.isoformat(), "id": last.id})
+        return RatingListResponse(
+            movie_id=movie_id,
+            page_size=page_size,
+            has_more=has_more,
+            items=[RatingListItem(rating_id=row.id, score=row.score, created_at=row.rated_at) for row in rows],
+            next_cursor=next_cursor,
+        )
+
+    def get_rating_stats(
+        self, movie_id: int, interval: str = "day", start: Optional[date] = None, end: Optional[date] = None, window: Optional[int] = None
+    ) -> RatingStatsResponse:
+        """Histograms, daily/weekly buckets and rolling averages of a movie's ratings, from the daily rollup."""
+        step = BUCKET_STEPS[interval]
+        end = end or datetime.now(timezone.utc).date()
+        if end > MAX_BUCKET_DATE or (start or end) < MIN_BUCKET_DATE:
+            raise InvalidStatsRangeError(f"Dates must be between {MIN_BUCKET_DATE} and {MAX_BUCKET_DATE}")
+        start = start or end - min(step * (DEFAULT_STATS_BUCKETS[interval] - 1), end - MIN_BUCKET_DATE)
+        window = window or (7 if interval == "day" else 4)
+        if start > end:
+            raise InvalidStatsRangeError("start must not be after end")
+        if (end - start) // step + 1 > MAX_STATS_BUCKETS:
+            raise InvalidStatsRangeError(f"Range spans more than {MAX_STATS_BUCKETS} {interval} buckets")
+
+        self._ensure_movie_exists(movie_id)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = f"{self.cache.detail_key(movie_id)}:rating-stats:{interval}:{start}:{end}:{window}"
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        stats = self.stats_repo.get_by_movie_id(movie_id)
+        overall = dict.fromkeys(COUNTER_COLUMNS, 0) if stats is None else {column: getattr(stats, column) for column in COUNTER_COLUMNS}
+
+        period = dict.fromkeys(COUNTER_COLUMNS, 0)
+        buckets = []
+        for row in self.stats_repo.get_buckets(movie_id, interval, start, end, window):
+            for column in COUNTER_COLUMNS:
+                period[column] += getattr(row, column)
+            buckets.append(
+                RatingBucket(
+                    start=row.bucket,
+                    ratings_count=row.ratings_count,
+                    average_rating=_average(row.ratings_sum, row.ratings_count),
+                    rolling_average=_average(row.rolling_sum, row.rolling_count),
+                    histogram={score: getattr(row, f"score_{score}") for score in SCORE_VALUES},
+                )
+            )
+
+        response = RatingStatsResponse(
+            movie_id=movie_id,
+            interval=interval,
+            start=start,
+            end=end,
+            window=window,
+            overall=_summary(overall),
+            period=_summary(period),
+            buckets=buckets,
+        )
+        if cache_key is not None:
+            self.cache.set(cache_key, response, movie_id=movie_id, from_replica=is_replica_session(self.db))
+        return response
@@ -0,0 +1,188 @@
+import logging
+import queue
+import threading
+import time
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+from app.cache.movie import MovieCache
+from app.cache import known_movie_ids, movie_cache
+from app.cache.movie_ids import KnownMovieIds
+from app.config import settings
+from app.db.errors import is_foreign_key_violation
+from app.db.session import SessionLocal
+from app.exceptions.rating import RatingBufferFullError
+from app.metrics import rating_writes_total
+from app.repositories.movie import MovieRepository
+from app.repositories.movie_rating import MovieRatingRepository
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class RatingWriteBuffer:
+    """Bounded in-process queue of (movie_id, score) ratings flushed in batches by a background thread.
+
+    Each flush is one transaction (group commit), triggered when `batch_size` ratings are
+    queued or `flush_interval` seconds after the first rating of a batch arrived.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+        synchronous_commit: bool = True,
+        cache: Optional[MovieCache] = None,
+        known_ids: Optional[KnownMovieIds] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.synchronous_commit = synchronous_commit
+        self.cache = cache
+        self.known_ids = known_ids
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._enqueued = 0
+        self._rejected = 0
+        self._flushed = 0
+        self._dropped = 0
+        self._batches = 0
+        self._failed_batches = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="rating-write-buffer", daemon=True)
+        self._thread.start()
+        logger.info("Rating write buffer started (batch_size=%s, flush_interval=%ss)", self.batch_size, self.flush_interval)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Flush everything still queued, then stop the worker."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Rating write buffer did not drain in time (pending=%s)", self._queue.qsize())
+        else:
+            logger.info("Rating write buffer stopped (flushed=%s)", self._flushed)
+        self._thread = None
+
+    def submit(self, movie_id: int, score: int) -> None:
+        """Queue a validated rating without blocking; raises RatingBufferFullError when full."""
+        try:
+            self._queue.put_nowait((movie_id, score))
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise RatingBufferFullError()
+        with self._lock:
+            self._enqueued += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": self._queue.qsize(),
+                "capacity": self._queue.maxsize,
+                "enqueued": self._enqueued,
+                "rejected": self._rejected,
+                "flushed": self._flushed,
+                "dropped": self._dropped,
+                "batches": self._batches,
+                "failed_batches": self._failed_batches,
+                "synchronous_commit": self.synchronous_commit,
+            }
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+        self._drain()
+
+    def _drain(self) -> None:
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch: list[tuple[int, int]]) -> None:
+        db: Session = self.session_factory()
+        try:
+            try:
+                MovieRatingRepository(db).bulk_create(batch, synchronous_commit=self.synchronous_commit)
+            except IntegrityError as e:
+                if not is_foreign_key_violation(e):
+                    raise
+                # A movie was deleted after its ratings were queued; write the rest
+                db.rollback()
+                batch_ids = {movie_id for movie_id, _ in batch}
+                existing_ids = MovieRepository(db).get_existing_ids(batch_ids)
+                if self.known_ids is not None:
+                    for movie_id in batch_ids - existing_ids:
+                        self.known_ids.discard(movie_id)
+                kept = [rating for rating in batch if rating[0] in existing_ids]
+                MovieRatingRepository(db).bulk_create(kept, synchronous_commit=self.synchronous_commit)
+                with self._lock:
+                    self._dropped += len(batch) - len(kept)
+                batch = kept
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._failed_batches += 1
+                self._dropped += len(batch)
+            logger.error("Failed to flush rating batch (size=%s)", len(batch), exc_info=True)
+            return
+        finally:
+            db.close()
+
+        if self.cache is not None:
+            for movie_id in {movie_id for movie_id, _ in batch}:
+                self.cache.invalidate_movie(movie_id, lists=False)
+        rating_writes_total.inc(len(batch), labels=("flushed",))
+        with self._lock:
+            self._flushed += len(batch)
+            self._batches += 1
+
+
+rating_buffer: Optional[RatingWriteBuffer] = (
+    RatingWriteBuffer(
+        SessionLocal,
+        max_size=settings.RATING_BUFFER_MAX_SIZE,
+        batch_size=settings.RATING_BUFFER_BATCH_SIZE,
+        flush_interval=settings.RATING_BUFFER_FLUSH_INTERVAL_MS / 1000,
+        synchronous_commit=settings.RATING_BUFFER_SYNCHRONOUS_COMMIT,
+        cache=movie_cache,
+        known_ids=known_movie_ids,
+    )
+    if settings.RATING_WRITE_BEHIND
+    else None
+)
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Iterator, Optional
+from sqlalchemy.orm import Session
+from app.exceptions.movie import MovieNotFoundError
+from app.repositories.movie import MovieRepository
+from app.repositories.movie_rating import MovieRatingRepository
+from app.schemas.rating import RatingListItem
+
+
+def iter_movie_ratings_ndjson(
+    db: Session, movie_id: int, descending: bool, after: Optional[tuple[datetime, int]], batch_size: int
+) -> Iterator[bytes]:
+    """Stream a movie's ratings as NDJSON, one encoded batch of rows per chunk, from a server-side cursor.
+
+    Raises MovieNotFoundError before yielding anything if the movie does not exist.
+    """
+    if not MovieRepository(db).exists(movie_id):
+        raise MovieNotFoundError(movie_id)
+
+    lines = []
+    for row in MovieRatingRepository(db).iter_by_movie_id(movie_id, descending, after, batch_size):
+        lines.append(RatingListItem(rating_id=row.id, score=row.score, created_at=row.rated_at).model_dump_json())
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
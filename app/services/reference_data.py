@@ -0,0 +1,37 @@
+import logging
+from sqlalchemy.orm import Session
+from app.cache import director_cache, genre_cache
+from app.config import settings
+from app.db.session import SessionLocal
+from app.repositories.director import DirectorRepository
+from app.repositories.genre import GenreRepository
+from app.schemas.director import DirectorDetail
+
+logger = logging.getLogger(__name__)
+
+
+def load_reference_data() -> None:
+    """Fill the genre cache and warm the director LRU (up to its capacity) at startup.
+
+    A failure is only logged: both caches also fill on demand.
+    """
+    if genre_cache is None and director_cache is None:
+        return
+    db: Session = SessionLocal()
+    try:
+        if genre_cache is not None:
+            genre_cache.load((genre.id, genre.name) for genre in GenreRepository(db).get_all())
+        if director_cache is not None:
+            for director in DirectorRepository(db).get_all(limit=settings.DIRECTOR_CACHE_MAX_ENTRIES):
+                director_cache.set(
+                    DirectorDetail(id=director.id, name=director.name, birth_year=director.birth_year, description=director.description)
+                )
+        logger.info(
+            "Reference data loaded (genres=%s, directors=%s)",
+            genre_cache.stats()["genres"] if genre_cache is not None else None,
+            director_cache.stats()["entries"] if director_cache is not None else None,
+        )
+    except Exception:
+        logger.warning("Failed to load reference data; caches will fill on demand", exc_info=True)
+    finally:
+        db.close()
@@ -0,0 +1,31 @@
+from functools import partial
+from typing import Any, Callable, Generic, TypeVar, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+S = TypeVar("S")
+
+
+class ServiceRunner(Generic[S]):
+    """Awaitable facade over a synchronous service bound to the request's database session.
+
+    Services and repositories are written once against a sync Session. With an AsyncSession
+    (DB_ASYNC=true) each call runs through AsyncSession.run_sync, so database I/O is awaited on
+    the event loop via asyncpg; with a sync Session the call is offloaded to the threadpool.
+    Either way, `await runner.method(...)` calls `service.method(...)`.
+    """
+
+    def __init__(self, db: Union[Session, AsyncSession], factory: Callable[[Session], S]):
+        self.db = db
+        self.factory = factory
+
+    async def run(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(lambda sync_db: getattr(self.factory(sync_db), method)(*args, **kwargs))
+        return await run_in_threadpool(lambda: getattr(self.factory(self.db), method)(*args, **kwargs))
+
+    def __getattr__(self, method: str) -> Callable[..., Any]:
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return partial(self.run, method)
@@ -0,0 +1,33 @@
+import base64
+import binascii
+import json
+from typing import Any
+from app.exceptions.pagination import InvalidCursorError
+
+# Range of the integer (int4) columns cursors carry; larger values would fail in the database
+INT4_MIN, INT4_MAX = -(2**31), 2**31 - 1
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor string."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode a cursor produced by encode_cursor, raising InvalidCursorError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise InvalidCursorError()
+    if not isinstance(payload, dict):
+        raise InvalidCursorError()
+    return payload
+
+
+def valid_cursor_value(value: Any, types: tuple[type, ...]) -> bool:
+    """Whether a decoded cursor value has one of types (never bool) and, if an integer, fits an int4 column."""
+    if isinstance(value, bool) or not isinstance(value, types):
+        return False
+    return not isinstance(value, int) or INT4_MIN <= value <= INT4_MAX
@@ -0,0 +1,48 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+from app.config import settings
+
+
+def etag_for_body(body: bytes) -> str:
+    """Strong ETag derived from the serialized response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the current validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Create an empty 304 Not Modified response carrying the validators."""
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
+
+
+def with_cache_headers(response: Response, etag: str, last_modified: Optional[datetime] = None) -> Response:
+    response.headers.update(cache_headers(etag, last_modified))
+    return response
@@ -0,0 +1,13 @@
+from typing import Awaitable, Callable
+from app.db.query_stats import current_query_stats
+
+
+def query_budget(max_queries: int) -> Callable[[], Awaitable[None]]:
+    """Route dependency declaring the most statements the route may run per request."""
+
+    async def declare_budget() -> None:
+        stats = current_query_stats()
+        if stats is not None:
+            stats.budget = max_queries
+
+    return declare_budget
@@ -1,20 +1,22 @@
 from typing import Any
 from fastapi import Response
-from fastapi.responses import JSONResponse
 from app.schemas.response import SuccessResponse, ErrorResponse, ErrorDetail
 
 
-def success_response(data: Any, status_code: int = 200) -> JSONResponse:
-    """Create a success response with the standard envelope format."""
-    response = SuccessResponse(status="success", data=data)
-    return JSONResponse(content=response.model_dump(mode="json"), status_code=status_code)
+def success_response(data: Any, status_code: int = 200) -> Response:
+    """Create a success response with the standard envelope format.
 
+    Pass Pydantic models as they are: the envelope and the data are serialized to JSON in one pass.
+    """
+    body = SuccessResponse(status="success", data=data).model_dump_json()
+    return Response(content=body, status_code=status_code, media_type="application/json")
 
-def error_response(message: str, status_code: int = 400) -> JSONResponse:
+
+def error_response(message: str, status_code: int = 400) -> Response:
     """Create an error response with the standard envelope format."""
     error_detail = ErrorDetail(code=status_code, message=message)
-    response = ErrorResponse(status="failure", error=error_detail)
-    return JSONResponse(content=response.model_dump(), status_code=status_code)
+    body = ErrorResponse(status="failure", error=error_detail).model_dump_json()
+    return Response(content=body, status_code=status_code, media_type="application/json")
 
 
 def empty_response() -> Response:
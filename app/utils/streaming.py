@@ -0,0 +1,88 @@
+import csv
+import json
+from typing import Any, AsyncIterator
+from fastapi import Request
+from app.exceptions.bulk import InvalidBulkPayloadError
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+
+
+def content_type(request: Request) -> str:
+    return request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+async def iter_lines(request: Request) -> AsyncIterator[bytes]:
+    """Yield the lines of a streamed request body without the trailing newline."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def iter_ndjson(request: Request) -> AsyncIterator[Any]:
+    """Yield one decoded item per non-empty line of a streamed NDJSON body."""
+    line_number = 0
+    async for line in iter_lines(request):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            raise InvalidBulkPayloadError(f"Malformed JSON on line {line_number}")
+
+
+async def iter_json_array(request: Request) -> AsyncIterator[Any]:
+    try:
+        items = await request.json()
+    except ValueError:
+        raise InvalidBulkPayloadError("Body must be a JSON array")
+    if not isinstance(items, list):
+        raise InvalidBulkPayloadError("Body must be a JSON array")
+    for item in items:
+        yield item
+
+
+async def iter_csv(request: Request) -> AsyncIterator[dict[str, str]]:
+    """Yield one dict per record of a streamed CSV body, keyed by the header row.
+
+    Quoted fields may contain newlines: physical lines are joined until their quotes balance.
+    """
+    header = None
+    pending = ""
+    async for line in iter_lines(request):
+        try:
+            text = line.decode("utf-8-sig" if header is None and not pending else "utf-8").rstrip("\r")
+        except UnicodeDecodeError:
+            raise InvalidBulkPayloadError("CSV body must be UTF-8")
+        pending = f"{pending}\n{text}" if pending else text
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        fields = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+        if len(fields) != len(header):
+            raise InvalidBulkPayloadError(f"CSV record has {len(fields)} fields, header has {len(header)}")
+        yield dict(zip(header, fields))
+    if pending:
+        raise InvalidBulkPayloadError("CSV body ends inside a quoted field")
+
+
+async def iter_chunks(items: AsyncIterator[Any], size: int) -> AsyncIterator[list[Any]]:
+    chunk: list[Any] = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,65 @@
+import json
+import math
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(durations: list[float], elapsed: float) -> dict[str, float]:
+    """Latency percentiles in milliseconds and throughput for a list of durations in seconds."""
+    values = sorted(durations)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+        "throughput_per_s": round(len(values) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(kind: str, parameters: dict[str, Any], results: dict[str, Any], output: str = None) -> Path:
+    """Store a run as JSON (benchmarks/results/<kind>-<timestamp>-<revision>.json unless output is given)."""
+    started = datetime.now(timezone.utc)
+    revision = git_revision()
+    path = Path(output) if output else RESULTS_DIR / f"{kind}-{started:%Y%m%dT%H%M%S}-{revision}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "kind": kind,
+        "revision": revision,
+        "created_at": started.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "parameters": parameters,
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+    return path
+
+
+def print_table(results: dict[str, dict[str, float]]) -> None:
+    print(f"{'name':<32} {'count':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>10}")
+    for name, summary in results.items():
+        print(
+            f"{name:<32} {summary['count']:>8} {summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f}"
+            f" {summary['p99_ms']:>9.2f} {summary['throughput_per_s']:>10.1f}"
+        )
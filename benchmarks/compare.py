@@ -0,0 +1,46 @@
+"""Compare two benchmark result files and flag latency regressions.
+
+    python -m benchmarks.compare benchmarks/results/micro-A.json benchmarks/results/micro-B.json --threshold 10
+
+Exits with status 1 when any scenario's p95 got slower by more than the threshold (percent).
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_per_s")
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p95 slowdown in percent")
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.candidate) as candidate_file:
+        baseline, candidate = json.load(baseline_file), json.load(candidate_file)
+    print(f"baseline {baseline['revision']} ({baseline['created_at']}) -> candidate {candidate['revision']} ({candidate['created_at']})")
+    print(f"{'name':<32}" + "".join(f"{metric:>22}" for metric in METRICS))
+
+    regressions = []
+    for name, after in candidate["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        cells = "".join(f"{after[metric]:>12.2f} ({_change(before[metric], after[metric]):+6.1f}%)" for metric in METRICS)
+        print(f"{name:<32}{cells}")
+        if _change(before["p95_ms"], after["p95_ms"]) > args.threshold:
+            regressions.append(name)
+
+    if regressions:
+        print(f"p95 regressions over {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""HTTP load test with a weighted mix of list/search/detail/rate requests.
+
+    python -m benchmarks.load --base-url http://localhost:8000 --duration 30 --concurrency 32
+
+Start the API separately (e.g. `uvicorn app.main:app --workers 4`). Reports p50/p95/p99 latency and
+throughput per scenario and overall, and writes them to benchmarks/results/ as JSON.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Callable
+import httpx
+from benchmarks.common import print_table, summarize, write_results
+
+SEARCH_TERMS = ["star", "night", "dark", "king", "matrix", "love", "war", "ghost"]
+GENRES = ["Drama", "Action", "Comedy", "Thriller", "Sci-Fi"]
+
+
+def _scenarios(rng: random.Random, max_movie_id: int) -> dict[str, Callable[[], tuple[str, str, dict]]]:
+    """Each scenario returns (method, path, request kwargs)."""
+    return {
+        "list": lambda: ("GET", "/api/v1/movies", {"params": {"page": rng.randint(1, 20), "page_size": 20}}),
+        "list_genre": lambda: ("GET", "/api/v1/movies", {"params": {"genre": rng.choice(GENRES), "page_size": 20, "count": "none"}}),
+        "search": lambda: ("GET", "/api/v1/movies", {"params": {"title": rng.choice(SEARCH_TERMS), "sort": "relevance", "count": "none"}}),
+        "detail": lambda: ("GET", f"/api/v1/movies/{rng.randint(1, max_movie_id)}", {}),
+        "rate": lambda: ("POST", f"/api/v1/movies/{rng.randint(1, max_movie_id)}/ratings", {"json": {"score": rng.randint(1, 10)}}),
+    }
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+async def _worker(client, scenarios, names, weights, deadline, rng, durations, errors) -> None:
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        method, path, kwargs = scenarios[name]()
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            failed = response.status_code >= 500 or (response.status_code >= 400 and response.status_code != 404)
+        except httpx.HTTPError:
+            failed = True
+        durations[name].append(time.perf_counter() - started)
+        if failed:
+            errors[name] += 1
+
+
+async def run(base_url: str, duration: float, concurrency: int, mix: dict[str, int], max_movie_id: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    scenarios = _scenarios(rng, max_movie_id)
+    unknown = set(mix) - set(scenarios)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))} (available: {', '.join(scenarios)})")
+    names, weights = list(mix), list(mix.values())
+    durations: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        try:
+            (await client.get("/")).raise_for_status()
+        except httpx.HTTPError as exc:
+            raise SystemExit(f"API not reachable at {base_url}: {exc}")
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(
+            *(_worker(client, scenarios, names, weights, deadline, random.Random(seed + index), durations, errors) for index in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started
+
+    results = {name: {**summarize(values, elapsed), "errors": errors[name]} for name, values in sorted(durations.items())}
+    results["total"] = {
+        **summarize([value for values in durations.values() for value in values], elapsed),
+        "errors": sum(errors.values()),
+    }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default="list=30,list_genre=10,search=15,detail=35,rate=10", help="scenario=weight,...")
+    parser.add_argument("--max-movie-id", type=int, default=1000, help="detail/rate requests pick ids in 1..N")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/load-<timestamp>-<revision>.json)")
+    args = parser.parse_args()
+
+    mix = _parse_mix(args.mix)
+    results = asyncio.run(run(args.base_url, args.duration, args.concurrency, mix, args.max_movie_id, args.seed))
+    print_table(results)
+    print(f"errors: {results['total']['errors']}")
+    path = write_results("load", {**vars(args), "mix": mix}, results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
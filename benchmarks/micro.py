@@ -0,0 +1,86 @@
+"""Time the repository hot paths against the configured database.
+
+    python -m benchmarks.micro --iterations 500
+
+Writes results to benchmarks/results/ as JSON. The rating benchmark inserts real rows,
+so run it against a benchmark database (see benchmarks.seed).
+"""
+import argparse
+import random
+import time
+from typing import Callable
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.models.genre import Genre
+from app.models.movie import Movie
+from app.repositories.movie import MovieRepository
+from app.repositories.movie_rating import MovieRatingRepository
+from benchmarks.common import print_table, summarize, write_results
+
+
+def _time(operation: Callable[[], object], iterations: int, warmup: int) -> dict[str, float]:
+    for _ in range(warmup):
+        operation()
+    durations = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        begin = time.perf_counter()
+        operation()
+        durations.append(time.perf_counter() - begin)
+    return summarize(durations, time.perf_counter() - started)
+
+
+def _scenarios(session: Session, rng: random.Random) -> dict[str, Callable[[], object]]:
+    movie_repo = MovieRepository(session)
+    rating_repo = MovieRatingRepository(session)
+    max_id = session.execute(select(func.max(Movie.id))).scalar() or 1
+    genre_ids = list(session.execute(select(Genre.id)).scalars()) or [None]
+
+    def random_movie_id() -> int:
+        return rng.randint(1, max_id)
+
+    def run_and_reset(operation: Callable[[], object]) -> Callable[[], object]:
+        # Drop loaded objects so every iteration hits the database instead of the identity map
+        def run() -> object:
+            result = operation()
+            session.rollback()
+            session.expunge_all()
+            return result
+
+        return run
+
+    return {
+        "list_first_page": run_and_reset(lambda: movie_repo.get_list_with_stats(page=1, page_size=20)),
+        "list_deep_offset_page": run_and_reset(lambda: movie_repo.get_list_with_stats(page=max(max_id // 40, 1), page_size=20)),
+        "list_no_count": run_and_reset(lambda: movie_repo.get_list_with_stats(page=1, page_size=20, count="none")),
+        "list_genre_filter": run_and_reset(lambda: movie_repo.get_list_with_stats(page=1, page_size=20, genre_id=rng.choice(genre_ids))),
+        "list_title_search": run_and_reset(lambda: movie_repo.get_list_with_stats(page=1, page_size=20, title="star", sort="relevance")),
+        "movie_with_stats": run_and_reset(lambda: movie_repo.get_movie_with_stats(random_movie_id())),
+        "rating_create": run_and_reset(lambda: rating_repo.create(movie_id=random_movie_id(), score=rng.randint(1, 10))),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--only", nargs="*", help="run only these scenarios")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/micro-<timestamp>-<revision>.json)")
+    args = parser.parse_args()
+
+    results = {}
+    with SessionLocal() as session:
+        for name, operation in _scenarios(session, random.Random(args.seed)).items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = _time(operation, args.iterations, args.warmup)
+
+    print_table(results)
+    path = write_results("micro", vars(args), results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
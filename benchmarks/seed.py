@@ -0,0 +1,141 @@
+"""Generate a benchmark catalogue directly with COPY.
+
+    python -m benchmarks.seed --movies 100000 --ratings 10000000 --truncate
+
+Run against a dedicated database: --truncate empties every table first.
+"""
+import argparse
+import random
+import time
+from typing import Iterator
+from sqlalchemy import text
+from app.db.session import SessionLocal, engine
+from app.repositories.movie_rating_stats import MovieRatingStatsRepository
+
+GENRES = [
+    "Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama", "Family", "Fantasy", "History",
+    "Horror", "Music", "Mystery", "Romance", "Sci-Fi", "Thriller", "War", "Western",
+]
+WORDS = [
+    "night", "star", "dark", "return", "last", "city", "love", "war", "dream", "river", "king", "secret", "shadow",
+    "empire", "matrix", "storm", "ghost", "iron", "silent", "golden", "lost", "blue", "wild", "final", "summer",
+]
+COPY_BATCH_ROWS = 50000
+
+
+class RowStream:
+    """File-like object feeding COPY from a generator of tab-separated lines, without materializing them."""
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            chunk = "".join(line for _, line in zip(range(COPY_BATCH_ROWS), self._lines))
+            if not chunk:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _copy(cursor, table: str, columns: list[str], lines: Iterator[str]) -> None:
+    started = time.perf_counter()
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", RowStream(lines))
+    print(f"  {table}: {cursor.rowcount} rows in {time.perf_counter() - started:.1f}s")
+
+
+def _title(rng: random.Random, movie_id: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title() + f" {movie_id}"
+
+
+def seed(movies: int, directors: int, ratings: int, truncate: bool, seed_value: int) -> None:
+    rng = random.Random(seed_value)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if truncate:
+            cursor.execute(
+                "TRUNCATE movie_ratings, movie_rating_stats, movie_genres, movies, directors, genres RESTART IDENTITY CASCADE"
+            )
+        # Continue after any existing ids so the seeder can also grow a catalogue
+        cursor.execute("SELECT coalesce(max(id), 0) FROM directors")
+        director_offset = cursor.fetchone()[0]
+        cursor.execute("SELECT coalesce(max(id), 0) FROM movies")
+        movie_offset = cursor.fetchone()[0]
+        cursor.execute("SELECT count(*) FROM genres")
+        if cursor.fetchone()[0] == 0:
+            _copy(cursor, "genres", ["id", "name"], (f"{index}\t{name}\n" for index, name in enumerate(GENRES, start=1)))
+        cursor.execute("SELECT id FROM genres")
+        genre_ids = [row[0] for row in cursor.fetchall()]
+
+        director_ids = range(director_offset + 1, director_offset + directors + 1)
+        movie_ids = range(movie_offset + 1, movie_offset + movies + 1)
+        _copy(
+            cursor,
+            "directors",
+            ["id", "name", "birth_year"],
+            (f"{director_id}\tDirector {director_id}\t{rng.randint(1920, 1995)}\n" for director_id in director_ids),
+        )
+        _copy(
+            cursor,
+            "movies",
+            ["id", "title", "director_id", "release_year", '"cast"'],
+            (
+                f"{movie_id}\t{_title(rng, movie_id)}\t{rng.choice(director_ids)}\t{rng.randint(1950, 2025)}\tCast {movie_id}\n"
+                for movie_id in movie_ids
+            ),
+        )
+        _copy(
+            cursor,
+            "movie_genres",
+            ["movie_id", "genre_id"],
+            (
+                f"{movie_id}\t{genre_id}\n"
+                for movie_id in movie_ids
+                for genre_id in rng.sample(genre_ids, rng.randint(1, min(3, len(genre_ids))))
+            ),
+        )
+        # Skewed towards a head of popular movies (like real rating traffic) while still reaching the tail
+        _copy(
+            cursor,
+            "movie_ratings",
+            ["movie_id", "score"],
+            (f"{movie_ids[int(movies * rng.random() ** 3)]}\t{rng.randint(1, 10)}\n" for _ in range(ratings)),
+        )
+        for table in ("directors", "movies", "genres"):
+            cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))")
+        raw.commit()
+    finally:
+        raw.close()
+
+    started = time.perf_counter()
+    with SessionLocal() as session:
+        rebuilt = MovieRatingStatsRepository(session).rebuild()
+    print(f"  movie_rating_stats: {rebuilt} rows in {time.perf_counter() - started:.1f}s")
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--directors", type=int, default=None, help="default: movies / 5")
+    parser.add_argument("--ratings", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed, for reproducible catalogues")
+    parser.add_argument("--truncate", action="store_true", help="empty all tables first")
+    args = parser.parse_args()
+
+    directors = args.directors or max(args.movies // 5, 1)
+    print(f"Seeding {args.movies} movies, {directors} directors, {args.ratings} ratings")
+    started = time.perf_counter()
+    seed(args.movies, directors, args.ratings, args.truncate, args.seed)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+
+from app.db.session import SessionLocal
+from app.repositories.movie_rating_stats import MovieRatingStatsRepository
+
+
+def rebuild_rating_stats(verify_only: bool = False) -> bool:
+    """Verifies movie_rating_stats against movie_ratings and repairs any drift."""
+    with SessionLocal() as session:
+        repo = MovieRatingStatsRepository(session)
+        drifted = repo.find_drift()
+        if not drifted:
+            print("Rating aggregates are consistent.")
+            return True
+
+        print(f"Found {len(drifted)} movie(s) with drifted rating aggregates.")
+        print(f"   - Movie ids: {drifted[:20]}{' ...' if len(drifted) > 20 else ''}")
+        if verify_only:
+            return False
+
+        rebuilt = repo.rebuild(drifted)
+        print(f"Rebuilt aggregates for {rebuilt} movie(s).")
+        return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify and repair per-movie rating aggregates.")
+    parser.add_argument("--verify-only", action="store_true", help="report drift without repairing it")
+    parser.add_argument("--full", action="store_true", help="rebuild aggregates for every movie")
+    args = parser.parse_args()
+
+    if args.full:
+        with SessionLocal() as session:
+            print(f"Rebuilt aggregates for {MovieRatingStatsRepository(session).rebuild()} movie(s).")
+    else:
+        raise SystemExit(0 if rebuild_rating_stats(verify_only=args.verify_only) else 1)
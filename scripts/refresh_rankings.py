@@ -0,0 +1,19 @@
+import argparse
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.services.ranking_refresher import MovieRankingRefresher
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute the leaderboard rankings of every rated movie.")
+    parser.add_argument("--min-votes", type=int, default=settings.RANKING_MIN_VOTES, help="Bayesian prior weight in votes")
+    parser.add_argument("--trending-days", type=int, default=settings.RANKING_TRENDING_DAYS, help="trending window in days")
+    args = parser.parse_args()
+
+    refresher = MovieRankingRefresher(SessionLocal, interval=0, min_votes=args.min_votes, trending_days=args.trending_days)
+    rows = refresher.refresh(full=True)
+    if rows is None:
+        print("Another refresh is running; try again later.")
+        raise SystemExit(1)
+    print(f"Refreshed rankings ({rows} row(s) changed, global mean {refresher.stats()['global_mean']}).")
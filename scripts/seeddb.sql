@@ -8,6 +8,9 @@ BEGIN;
 
 ------------------------------- 1. Cleanup Existing Data -----------------------------
 -- Delete existing data from final tables to ensure a clean run.
+DELETE FROM movie_rankings;
+DELETE FROM movie_rating_daily;
+DELETE FROM movie_rating_stats;
 DELETE FROM movie_ratings;
 DELETE FROM movie_genres;
 DELETE FROM movies;
@@ -187,4 +190,45 @@ SELECT
 FROM movies m,
 LATERAL generate_series(1, (1 + floor(random() * 40))::INT) AS s(i);
 
+------------------------------- 11. Build the rating aggregates -----------------------------
+-- The API reads ratings counts and averages from these tables, which the app only maintains on its own writes.
+-- movie_rankings is filled by the ranking refresher's first (full) refresh when the app starts.
+INSERT INTO movie_rating_stats (movie_id, ratings_sum, ratings_count, score_1, score_2, score_3, score_4, score_5, score_6, score_7, score_8, score_9, score_10, last_rated_at)
+SELECT
+    movie_id,
+    sum(score) AS ratings_sum,
+    count(*) AS ratings_count,
+    count(*) FILTER (WHERE score = 1) AS score_1,
+    count(*) FILTER (WHERE score = 2) AS score_2,
+    count(*) FILTER (WHERE score = 3) AS score_3,
+    count(*) FILTER (WHERE score = 4) AS score_4,
+    count(*) FILTER (WHERE score = 5) AS score_5,
+    count(*) FILTER (WHERE score = 6) AS score_6,
+    count(*) FILTER (WHERE score = 7) AS score_7,
+    count(*) FILTER (WHERE score = 8) AS score_8,
+    count(*) FILTER (WHERE score = 9) AS score_9,
+    count(*) FILTER (WHERE score = 10) AS score_10,
+    max(rated_at) AS last_rated_at
+FROM movie_ratings
+GROUP BY movie_id;
+
+INSERT INTO movie_rating_daily (movie_id, day, ratings_sum, ratings_count, score_1, score_2, score_3, score_4, score_5, score_6, score_7, score_8, score_9, score_10)
+SELECT
+    movie_id,
+    (rated_at AT TIME ZONE 'UTC')::DATE AS day, -- UTC calendar day, as written by the app
+    sum(score) AS ratings_sum,
+    count(*) AS ratings_count,
+    count(*) FILTER (WHERE score = 1) AS score_1,
+    count(*) FILTER (WHERE score = 2) AS score_2,
+    count(*) FILTER (WHERE score = 3) AS score_3,
+    count(*) FILTER (WHERE score = 4) AS score_4,
+    count(*) FILTER (WHERE score = 5) AS score_5,
+    count(*) FILTER (WHERE score = 6) AS score_6,
+    count(*) FILTER (WHERE score = 7) AS score_7,
+    count(*) FILTER (WHERE score = 8) AS score_8,
+    count(*) FILTER (WHERE score = 9) AS score_9,
+    count(*) FILTER (WHERE score = 10) AS score_10
+FROM movie_ratings
+GROUP BY movie_id, (rated_at AT TIME ZONE 'UTC')::DATE;
+
 COMMIT;
@@ -0,0 +1,82 @@
+import uuid
+from contextlib import contextmanager
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import delete
+from sqlalchemy.exc import SQLAlchemyError
+
+# app modules read settings on import, so they are imported inside the fixtures: without a
+# DATABASE_URL the database tests are skipped instead of failing collection.
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """The application's primary engine; tests using it are skipped when no database is configured or reachable."""
+    try:
+        from app.db.session import engine
+    except ValidationError:
+        pytest.skip("DATABASE_URL is not configured")
+    try:
+        with engine.connect():
+            pass
+    except SQLAlchemyError:
+        pytest.skip("database is not reachable")
+    from app.config import settings
+    from app.db.query_stats import instrument_engine
+
+    if not settings.QUERY_STATS_ENABLED:
+        instrument_engine(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    """`with statements() as stats:` counts the SQL statements run inside the block into stats.count."""
+    from app.db.query_stats import begin_query_stats, end_query_stats
+
+    @contextmanager
+    def count():
+        stats, token = begin_query_stats()
+        try:
+            yield stats
+        finally:
+            end_query_stats(token)
+
+    return count
+
+
+@pytest.fixture
+def movie(db):
+    """A throwaway movie with its own director and two genres (only the first linked): (movie_id, genre_ids)."""
+    from app.models import Director, Genre, Movie, MovieRating, movie_genres
+
+    suffix = uuid.uuid4().hex[:8]
+    director = Director(name=f"Test Director {suffix}")
+    genres = [Genre(name=f"Test Genre {suffix} {index}") for index in range(2)]
+    movie = Movie(title=f"Test Movie {suffix}", release_year=2000, director=director, genres=genres[:1])
+    db.add(movie)
+    db.add_all(genres)
+    db.commit()
+    movie_id, director_id, genre_ids = movie.id, director.id, [genre.id for genre in genres]
+    db.expunge_all()
+
+    yield movie_id, genre_ids
+
+    db.rollback()
+    db.execute(delete(MovieRating).where(MovieRating.movie_id == movie_id))
+    db.execute(delete(movie_genres).where(movie_genres.c.movie_id == movie_id))
+    db.execute(delete(Movie).where(Movie.id == movie_id))
+    db.execute(delete(Genre).where(Genre.id.in_(genre_ids)))
+    db.execute(delete(Director).where(Director.id == director_id))
+    db.commit()
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import select, text
+
+# The list/detail/aggregate queries must be servable by their secondary indexes. Sequential scans
+# are disabled so the result does not depend on table sizes: on a small database the planner would
+# rightly prefer scanning.
+
+
+def _release_year_filter(session):
+    from app.models import Movie
+    from app.repositories.movie import MovieRepository
+
+    return MovieRepository(session)._apply_filters(session.query(Movie.id), None, 1999, None).statement
+
+
+def _title_filter(session):
+    from app.models import Movie
+    from app.repositories.movie import MovieRepository
+
+    return MovieRepository(session)._apply_filters(session.query(Movie.id), "matrix", None, None).statement
+
+
+def _genre_filter(session):
+    from app.models import movie_genres
+
+    return select(movie_genres.c.movie_id).where(movie_genres.c.genre_id == 1)
+
+
+def _director_lookup(session):
+    from app.models import Movie
+
+    return select(Movie.id).where(Movie.director_id == 1)
+
+
+def _rating_aggregate(session):
+    from app.models import MovieRating
+    from app.repositories.movie_rating_stats import MovieRatingStatsRepository
+
+    return MovieRatingStatsRepository(session)._aggregate_query().where(MovieRating.movie_id == 1)
+
+
+def _index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+@pytest.mark.parametrize(
+    "build_statement, index_names",
+    [
+        (_release_year_filter, {"ix_movies_release_year_id"}),
+        (_title_filter, {"ix_movies_title_trgm"}),
+        (_genre_filter, {"ix_movie_genres_genre_id"}),
+        (_director_lookup, {"ix_movies_director_id"}),
+        # Either movie_id-leading index serves it; the keyset one covers score and rated_at too
+        (_rating_aggregate, {"ix_movie_ratings_movie_id_score", "ix_movie_ratings_movie_id_rated_at_id"}),
+    ],
+    ids=["release_year filter", "title filter", "genre filter", "director lookup", "rating aggregate"],
+)
+def test_query_uses_index(db, build_statement, index_names):
+    from app.db.explain import Explain
+
+    existing = set(db.execute(text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")).scalars())
+    if not index_names & existing:
+        pytest.skip(f"{sorted(index_names)} missing from this database")
+
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = db.execute(Explain(build_statement(db))).scalar()[0]["Plan"]
+
+    assert _index_names(plan) & index_names, f"plan used {sorted(_index_names(plan)) or 'no index'}"
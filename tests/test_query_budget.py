@@ -0,0 +1,65 @@
+import logging
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+
+@pytest.fixture
+def budget_client(engine):
+    """An app with the query stats middleware and one route that runs two statements on a budget of one."""
+    from app.middleware.query_stats import query_stats_middleware
+    from app.utils.query_budget import query_budget
+
+    app = FastAPI()
+    app.middleware("http")(query_stats_middleware)
+
+    @app.get("/two-queries", dependencies=[Depends(query_budget(1))])
+    def two_queries():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        return {}
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def strict_budgets(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+
+
+def test_over_budget_request_logs_a_warning(budget_client, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.middleware.query_stats"):
+        response = budget_client.get("/two-queries")
+
+    assert response.status_code == 200
+    assert response.headers["Server-Timing"].endswith('desc="2 queries"')
+    assert any(getattr(record, "db_query_budget", None) == 1 for record in caplog.records)
+
+
+def test_over_budget_request_fails_in_strict_mode(budget_client, strict_budgets):
+    response = budget_client.get("/two-queries")
+
+    assert response.status_code == 500
+    assert "Query budget exceeded: 2 > 1" in response.text
+
+
+def test_delete_movie_with_ratings_stays_within_budget(movie, db, strict_budgets):
+    from app.main import app
+    from app.models import MovieRating
+
+    movie_id, _ = movie
+    db.add_all(MovieRating(movie_id=movie_id, score=score) for score in range(1, 11))
+    db.commit()
+
+    client = TestClient(app)
+    response = client.delete(f"/api/v1/movies/{movie_id}")
+
+    assert response.status_code == 204
+    # Bulk DELETEs of the ratings, the genre links and the movie, whatever the number of ratings
+    assert response.headers["Server-Timing"].endswith('desc="3 queries"')
+    assert client.get(f"/api/v1/movies/{movie_id}").status_code == 404
+    assert db.query(MovieRating).filter(MovieRating.movie_id == movie_id).count() == 0
@@ -0,0 +1,70 @@
+import pytest
+
+# Statement counts for the write paths that used to re-fetch after every step. The bounds match
+# the query budgets declared on the routes (PUT /movies/{id}: 4, POST /movies/{id}/ratings: 4).
+
+
+@pytest.fixture
+def movie_service(db):
+    from app.services.dependencies import build_movie_service
+
+    return build_movie_service(db)
+
+
+@pytest.fixture
+def rating_service(db):
+    from app.repositories.movie import MovieRepository
+    from app.repositories.movie_rating import MovieRatingRepository
+    from app.repositories.movie_rating_stats import MovieRatingStatsRepository
+    from app.services.rating import RatingService
+
+    # Direct writes (no write-behind buffer), so the INSERT runs inside the request
+    return RatingService(
+        db=db, rating_repo=MovieRatingRepository(db), movie_repo=MovieRepository(db), stats_repo=MovieRatingStatsRepository(db)
+    )
+
+
+def test_update_movie_fields_runs_two_statements(movie_service, movie, statements):
+    from app.schemas.movie import MovieUpdate
+
+    movie_id, _ = movie
+    with statements() as stats:
+        updated = movie_service.update_movie(movie_id, MovieUpdate(title="Renamed", release_year=2001))
+
+    assert (updated.title, updated.release_year) == ("Renamed", 2001)
+    # UPDATE ... RETURNING, then the genre names
+    assert 1 <= stats.count <= 2
+
+
+def test_update_movie_genres_stays_within_budget(movie_service, movie, statements):
+    from app.schemas.movie import MovieUpdate
+
+    movie_id, genre_ids = movie
+    with statements() as stats:
+        updated = movie_service.update_movie(movie_id, MovieUpdate(title="Regenred", genres=[genre_ids[1]]))
+
+    assert len(updated.genres) == 1 and updated.genres[0].endswith(" 1")
+    # UPDATE ... RETURNING, genre lookup (when not cached), DELETE removed links, INSERT new links
+    assert 2 <= stats.count <= 4
+
+
+def test_update_missing_movie_stops_after_the_update(movie_service, engine, statements):
+    from app.exceptions.movie import MovieNotFoundError
+    from app.schemas.movie import MovieUpdate
+
+    with statements() as stats, pytest.raises(MovieNotFoundError):
+        movie_service.update_movie(2**31 - 1, MovieUpdate(title="Nobody"))
+
+    assert stats.count == 1
+
+
+def test_create_rating_stays_within_budget(rating_service, movie, statements):
+    from app.schemas.rating import RatingCreate
+
+    movie_id, _ = movie
+    with statements() as stats:
+        rating = rating_service.create_rating(movie_id, RatingCreate(score=7))
+
+    assert (rating.movie_id, rating.score) == (movie_id, 7)
+    # Existence check, INSERT, stats upsert, refresh of rated_at
+    assert 2 <= stats.count <= 4